@@ -5,19 +5,100 @@ These are the "origin" candles where price launched from.
 """
 
 import json
-from datetime import datetime, timezone
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in decorator so the kernels still run as plain Python."""
+        def wrap(fn):
+            return fn
+        return wrap
 
 DATA_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\1m_Candles\BTC_USDT_SWAP_1m.parquet")
 OUTPUT_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Objects\origins.json")
+# Columnar copy of origins.json for readers that only need a few columns
+PARQUET_PATH = OUTPUT_PATH.with_suffix('.parquet')
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Low-cardinality labels are dictionary-encoded (int8 codes + small string table)
+CATEGORY = pa.dictionary(pa.int8(), pa.string())
+
+ORIGIN_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("type", CATEGORY),
+    ("direction", CATEGORY),
+    ("zone_high", pa.float64()),
+    ("zone_low", pa.float64()),
+    ("zone_mid", pa.float64()),
+    ("displacement_pct", pa.float64()),
+    ("ts_created", pa.int64()),
+    ("datetime", pa.string()),
+    ("magnitude_score", pa.float64()),
+    ("volume_score", pa.float64()),
+    ("combined_score", pa.float64()),
+    ("state", CATEGORY),
+    ("distance", pa.float64()),
+])
+
 
 def save_origins(data):
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    if HAS_ORJSON:
+        OUTPUT_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(OUTPUT_PATH, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+STATE_NAMES = ('ACTIVE', 'HELD', 'FAILED')
+
+
+@njit(parallel=True, cache=True)
+def _find_revisits(cand_idx, highs, lows, opens, closes):
+    """State of each candidate zone at its first revisit (0=ACTIVE, 1=HELD, 2=FAILED)."""
+    n = len(highs)
+    states = np.zeros(len(cand_idx), dtype=np.int8)
+    
+    for k in prange(len(cand_idx)):
+        i = cand_idx[k]
+        zone_high = max(opens[i], closes[i])
+        zone_low = min(opens[i], closes[i])
+        bull = closes[i] > opens[i]
+        
+        for j in range(i + 1, n):
+            if bull:
+                if lows[j] <= zone_high:  # Came back to zone
+                    states[k] = 2 if closes[j] < zone_low else 1
+                    break
+            else:
+                if highs[j] >= zone_low:  # Came back to zone
+                    states[k] = 2 if closes[j] > zone_high else 1
+                    break
+    
+    return states
+
+
+def save_origins_parquet(origins):
+    table = pa.table(
+        {name: [o[name] for o in origins] for name in ORIGIN_SCHEMA.names},
+        schema=ORIGIN_SCHEMA,
+    )
+    pq.write_table(table, PARQUET_PATH)
 
 
 def find_origin_zones(df, min_displacement_pct=0.25):
@@ -33,69 +114,59 @@ def find_origin_zones(df, min_displacement_pct=0.25):
     volumes = df['volume'].values
     ts = df['timestamp'].values
     
-    current_price = closes[-1]
+    current_price = float(closes[-1])
     avg_range = (highs - lows).mean()
     avg_volume = volumes.mean()
     
-    for i in range(n - 1):
-        o, h, l, c = opens[i], highs[i], lows[i], closes[i]
-        candle_range = h - l
-        body = abs(c - o)
-        displacement_pct = (candle_range / o) * 100
-        
-        if displacement_pct < min_displacement_pct:
-            continue
-        
-        direction = 'BULL' if c > o else 'BEAR'
-        
-        # Define the zone
-        if direction == 'BULL':
-            zone_high = max(o, c)
-            zone_low = min(o, c)
-        else:
-            zone_high = max(o, c)
-            zone_low = min(o, c)
-        
-        # Check if zone was revisited and held/failed
-        state = 'ACTIVE'
-        for j in range(i + 1, n):
-            if direction == 'BULL':
-                if lows[j] <= zone_high:  # Came back to zone
-                    if closes[j] < zone_low:  # Failed
-                        state = 'FAILED'
-                    else:
-                        state = 'HELD'
-                    break
-            else:
-                if highs[j] >= zone_low:  # Came back to zone
-                    if closes[j] > zone_high:  # Failed
-                        state = 'FAILED'
-                    else:
-                        state = 'HELD'
-                    break
-        
-        # Magnitude score
-        magnitude = min(100, displacement_pct * 100)
-        
-        # Volume score
-        vol_ratio = volumes[i] / avg_volume
-        vol_score = min(100, vol_ratio * 30)
-        
+    # Only candles that clear the displacement cutoff become zones; all
+    # per-zone math below runs on the (small) candidate set
+    displacement = (highs[:-1] - lows[:-1]) / opens[:-1] * 100
+    cand_idx = np.flatnonzero(displacement >= min_displacement_pct)
+    states = _find_revisits(cand_idx, highs, lows, opens, closes)
+    # Candle opens are whole minutes, so this matches datetime.isoformat()
+    datetimes = pd.to_datetime(ts[cand_idx], unit='ms', utc=True).strftime('%Y-%m-%dT%H:%M:%S+00:00').tolist()
+    
+    o, c = opens[cand_idx], closes[cand_idx]
+    displacement_pct = displacement[cand_idx]
+    
+    # Define the zone
+    zone_high = np.maximum(o, c)
+    zone_low = np.minimum(o, c)
+    zone_mid = (zone_high + zone_low) / 2
+    
+    # Magnitude score
+    magnitude = np.minimum(100, displacement_pct * 100)
+    
+    # Volume score
+    vol_score = np.minimum(100, volumes[cand_idx] / avg_volume * 30)
+    
+    for t, bull, zh, zl, zm, disp, dt, mag, vs, state in zip(
+        ts[cand_idx].astype(np.int64).tolist(),
+        (c > o).tolist(),
+        zone_high.tolist(),
+        zone_low.tolist(),
+        zone_mid.tolist(),
+        displacement_pct.tolist(),
+        datetimes,
+        magnitude.tolist(),
+        vol_score.tolist(),
+        states.tolist(),
+    ):
         origins.append({
-            'id': f"OZ_{int(ts[i])}",
+            'id': f"OZ_{t}",
             'type': 'ORIGIN_ZONE',
-            'direction': direction,
-            'zone_high': float(zone_high),
-            'zone_low': float(zone_low),
-            'zone_mid': float((zone_high + zone_low) / 2),
-            'displacement_pct': round(displacement_pct, 3),
-            'ts_created': int(ts[i]),
-            'datetime': datetime.fromtimestamp(ts[i]/1000, tz=timezone.utc).isoformat(),
-            'magnitude_score': round(magnitude, 1),
-            'volume_score': round(vol_score, 1),
-            'combined_score': round((magnitude * 0.6 + vol_score * 0.4), 1),
-            'state': state,
-            'distance': float((zone_high + zone_low) / 2 - current_price),
+            'direction': 'BULL' if bull else 'BEAR',
+            'zone_high': zh,
+            'zone_low': zl,
+            'zone_mid': zm,
+            'displacement_pct': disp,
+            'ts_created': t,
+            'datetime': dt,
+            'magnitude_score': mag,
+            'volume_score': vs,
+            'combined_score': mag * 0.6 + vs * 0.4,
+            'state': STATE_NAMES[state],
+            'distance': zm - current_price,
         })
     
     return origins
@@ -113,6 +184,7 @@ def main():
     
     data = {'origins': origins}
     save_origins(data)
+    save_origins_parquet(origins)
     
     current_price = df.iloc[-1]['close']
     
@@ -139,6 +211,7 @@ def main():
             print(f"  {o['direction']:<5} ${o['zone_high']:>10,.2f} ${o['zone_low']:>10,.2f} {o['displacement_pct']:>6.2f}% {o['combined_score']:>6.1f}")
     
     print(f"\n  Saved to: {OUTPUT_PATH}")
+    print(f"            {PARQUET_PATH}")
 
 
 if __name__ == '__main__':
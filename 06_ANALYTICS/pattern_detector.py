@@ -17,69 +17,83 @@ except ImportError:
     print("pip install pandas numpy")
     exit(1)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 CANDLE_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\1m_Candles\BTC_USDT_SWAP_1m.parquet")
 PATTERN_LOG_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\pattern_touches.json")
+# Append-only log, one touch per line. The .json file is the legacy format;
+# its touches are folded into the log on startup and it is renamed aside.
+PATTERN_JSONL_PATH = PATTERN_LOG_PATH.with_suffix('.jsonl')
 
 
 # ============================================================================
 # CANDLE CLASSIFICATION
 # ============================================================================
 
-def classify_candle(o: float, h: float, l: float, c: float) -> Dict:
-    """Classify a single candle's characteristics."""
-    body = abs(c - o)
+PATTERN_TYPES = (
+    'NORMAL', 'DOJI', 'DOJI_STAR', 'GRAVESTONE_DOJI', 'DRAGONFLY_DOJI',
+    'HAMMER', 'HANGING_MAN', 'INVERTED_HAMMER', 'SHOOTING_STAR',
+    'MARUBOZU_BULL', 'MARUBOZU_BEAR', 'STRONG_BULL', 'STRONG_BEAR',
+)
+PATTERN_IDS = {name: i for i, name in enumerate(PATTERN_TYPES)}
+
+
+def _classify_batch(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Classify every candle of a frame in one pass.
+    
+    Works over whole arrays so the work is done once at load time
+    instead of per touch.
+    Returns (pattern_ids, body_pct, upper_wick_pct, lower_wick_pct, is_bullish).
+    """
+    body = np.abs(c - o)
     total_range = h - l
-    upper_wick = h - max(o, c)
-    lower_wick = min(o, c) - l
-    
-    if total_range == 0:
-        return {'type': 'DOJI', 'body_pct': 0, 'upper_wick_pct': 0, 'lower_wick_pct': 0}
+    upper_wick = h - np.maximum(o, c)
+    lower_wick = np.minimum(o, c) - l
     
-    body_pct = (body / total_range) * 100
-    upper_wick_pct = (upper_wick / total_range) * 100
-    lower_wick_pct = (lower_wick / total_range) * 100
+    flat = total_range == 0
+    safe_range = np.where(flat, 1.0, total_range)
+    body_pct = np.where(flat, 0.0, body / safe_range * 100)
+    upper_wick_pct = np.where(flat, 0.0, upper_wick / safe_range * 100)
+    lower_wick_pct = np.where(flat, 0.0, lower_wick / safe_range * 100)
     
     is_bullish = c > o
     
-    # Pattern detection
-    pattern = 'NORMAL'
-    
-    # Doji (tiny body)
-    if body_pct < 10:
-        if upper_wick_pct > 40 and lower_wick_pct > 40:
-            pattern = 'DOJI_STAR'
-        elif upper_wick_pct > 60:
-            pattern = 'GRAVESTONE_DOJI'
-        elif lower_wick_pct > 60:
-            pattern = 'DRAGONFLY_DOJI'
-        else:
-            pattern = 'DOJI'
-    
-    # Hammer / Hanging Man (small body, long lower wick)
-    elif lower_wick_pct > 60 and upper_wick_pct < 15:
-        pattern = 'HAMMER' if is_bullish else 'HANGING_MAN'
-    
-    # Inverted Hammer / Shooting Star (small body, long upper wick)
-    elif upper_wick_pct > 60 and lower_wick_pct < 15:
-        pattern = 'INVERTED_HAMMER' if is_bullish else 'SHOOTING_STAR'
-    
-    # Marubozu (full body, no wicks)
-    elif body_pct > 90:
-        pattern = 'MARUBOZU_BULL' if is_bullish else 'MARUBOZU_BEAR'
-    
-    # Strong candle (large body)
-    elif body_pct > 70:
-        pattern = 'STRONG_BULL' if is_bullish else 'STRONG_BEAR'
-    
-    return {
-        'type': pattern,
-        'is_bullish': is_bullish,
-        'body_pct': round(body_pct, 1),
-        'upper_wick_pct': round(upper_wick_pct, 1),
-        'lower_wick_pct': round(lower_wick_pct, 1),
-        'body_size': round(body, 2),
-        'range': round(total_range, 2),
-    }
+    # Pattern precedence follows the list order: np.select takes the first
+    # true condition, so every candle is resolved in one
+    # vectorized pass with no per-element branching. A zero-range candle
+    # has all percentages at 0 and falls into plain DOJI.
+    doji = body_pct < 10
+    
+    def side(bull_name, bear_name):
+        return np.where(is_bullish, PATTERN_IDS[bull_name], PATTERN_IDS[bear_name])
+    
+    conditions = [
+        doji & (upper_wick_pct > 40) & (lower_wick_pct > 40),
+        doji & (upper_wick_pct > 60),
+        doji & (lower_wick_pct > 60),
+        doji,
+        (lower_wick_pct > 60) & (upper_wick_pct < 15),
+        (upper_wick_pct > 60) & (lower_wick_pct < 15),
+        body_pct > 90,
+        body_pct > 70,
+    ]
+    choices = [
+        PATTERN_IDS['DOJI_STAR'],
+        PATTERN_IDS['GRAVESTONE_DOJI'],
+        PATTERN_IDS['DRAGONFLY_DOJI'],
+        PATTERN_IDS['DOJI'],
+        side('HAMMER', 'HANGING_MAN'),
+        side('INVERTED_HAMMER', 'SHOOTING_STAR'),
+        side('MARUBOZU_BULL', 'MARUBOZU_BEAR'),
+        side('STRONG_BULL', 'STRONG_BEAR'),
+    ]
+    pattern_ids = np.select(conditions, choices, default=PATTERN_IDS['NORMAL']).astype(np.int8)
+    
+    return pattern_ids, body_pct, upper_wick_pct, lower_wick_pct, is_bullish
 
 
 def detect_engulfing(prev_candle: Dict, curr_candle: Dict, prev_o: float, prev_c: float, curr_o: float, curr_c: float) -> Optional[str]:
@@ -100,28 +114,21 @@ def detect_engulfing(prev_candle: Dict, curr_candle: Dict, prev_o: float, prev_c
     return None
 
 
-def calculate_momentum(candles: List[Dict]) -> Dict:
-    """Calculate momentum from a series of candles."""
-    if not candles:
+def calculate_momentum(body_sizes: np.ndarray, is_bull: np.ndarray) -> Dict:
+    """Calculate momentum from a series of candle bodies and directions."""
+    n = len(body_sizes)
+    if n == 0:
         return {'direction': 'NEUTRAL', 'strength': 0, 'avg_body': 0}
     
-    total_move = 0
-    total_body = 0
-    bull_count = 0
-    
-    for c in candles:
-        if c.get('is_bullish'):
-            total_move += c.get('body_size', 0)
-            bull_count += 1
-        else:
-            total_move -= c.get('body_size', 0)
-        total_body += c.get('body_size', 0)
+    total_body = float(body_sizes.sum())
+    total_move = float(np.where(is_bull, body_sizes, -body_sizes).sum())
+    bull_count = int(is_bull.sum())
     
-    avg_body = total_body / len(candles) if candles else 0
+    avg_body = total_body / n
     
-    if bull_count > len(candles) * 0.6:
+    if bull_count > n * 0.6:
         direction = 'BULLISH'
-    elif bull_count < len(candles) * 0.4:
+    elif bull_count < n * 0.4:
         direction = 'BEARISH'
     else:
         direction = 'MIXED'
@@ -131,10 +138,10 @@ def calculate_momentum(candles: List[Dict]) -> Dict:
     
     return {
         'direction': direction,
-        'strength': round(min(100, strength), 1),
-        'avg_body': round(avg_body, 2),
-        'net_move': round(total_move, 2),
-        'bull_ratio': round(bull_count / len(candles) * 100, 1) if candles else 0,
+        'strength': min(100, strength),
+        'avg_body': avg_body,
+        'net_move': total_move,
+        'bull_ratio': bull_count / n * 100,
     }
 
 
@@ -175,11 +182,28 @@ def analyze_volume_cluster(volumes: List[float], avg_volume: float) -> Dict:
     
     return {
         'cluster_type': cluster_type,
-        'volume_ratio': round(vol_ratio, 2),
+        'volume_ratio': vol_ratio,
         'spike_location': spike_location,
-        'max_volume': round(max_vol, 2),
-        'touch_volume': round(touch_vol, 2),
-        'avg_cluster_volume': round(sum(volumes) / len(volumes), 2),
+        'max_volume': max_vol,
+        'touch_volume': touch_vol,
+        'avg_cluster_volume': sum(volumes) / len(volumes),
+    }
+
+
+# ============================================================================
+# PATTERN STATS
+# ============================================================================
+
+def _bounce_rates(labels: List[str], bounced: np.ndarray, min_count: int = 3) -> Dict:
+    """Touch count and 15m bounce rate per label, for labels with at least min_count touches."""
+    names, codes, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    bounces = np.bincount(codes, weights=bounced, minlength=len(names))
+    rates = bounces / np.maximum(counts, 1) * 100
+    
+    return {
+        name: {'count': int(count), 'bounce_rate': round(float(rate), 1)}
+        for name, count, rate in zip(names.tolist(), counts, rates)
+        if count >= min_count
     }
 
 
@@ -187,6 +211,18 @@ def analyze_volume_cluster(volumes: List[float], avg_volume: float) -> Dict:
 # PATTERN TOUCH LOGGER
 # ============================================================================
 
+def _loads(data: bytes):
+    """Parse JSON, using orjson when available."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _dumps_line(obj) -> bytes:
+    """Serialize one record as a JSONL line."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, default=str) + '\n').encode()
+
+
 @dataclass
 class PatternTouch:
     """Complete pattern data for a level touch."""
@@ -220,38 +256,101 @@ class PatternTouch:
 class PatternTouchLogger:
     """Logs pattern data at level touches."""
     
-    def __init__(self):
+    def __init__(self, skip_load: bool = False):
+        """skip_load=True leaves the touch history on disk (for bots that only append)."""
         self.touches: List[PatternTouch] = []
         self.df = None
         self.avg_volume = 0
+        self._loaded = not skip_load
+        self._migrate_legacy()
         self.load_candles()
-        self.load_existing()
+        if self._loaded:
+            self.load_existing()
     
     def load_candles(self):
-        """Load candle data."""
+        """Load candle data and classify every candle once."""
         if CANDLE_PATH.exists():
             self.df = pd.read_parquet(CANDLE_PATH).sort_values('timestamp').reset_index(drop=True)
+            
+            self._o = self.df['open'].to_numpy(dtype=np.float64)
+            self._h = self.df['high'].to_numpy(dtype=np.float64)
+            self._l = self.df['low'].to_numpy(dtype=np.float64)
+            self._c = self.df['close'].to_numpy(dtype=np.float64)
+            self._v = self.df['volume'].to_numpy(dtype=np.float64)
+            self._ts = self.df['timestamp'].to_numpy(dtype=np.int64)
+            
+            (self._pattern_ids, self._body_pct, self._up_pct,
+             self._low_pct, self._is_bull) = _classify_batch(self._o, self._h, self._l, self._c)
+            self._body = np.abs(self._c - self._o)
+            self._range = self._h - self._l
+            
             # Calculate average volume (last 1000 candles)
-            if len(self.df) > 1000:
-                self.avg_volume = self.df.tail(1000)['volume'].mean()
-            else:
-                self.avg_volume = self.df['volume'].mean()
+            self.avg_volume = float(self._v[-1000:].mean()) if self._v.size else 0
     
     def load_existing(self):
         """Load existing touch patterns."""
-        if PATTERN_LOG_PATH.exists():
-            try:
-                with open(PATTERN_LOG_PATH) as f:
-                    data = json.load(f)
-                    # Don't convert back to dataclass, just keep as dict list
-                    self.touches = data
-            except:
-                self.touches = []
+        try:
+            # Don't convert back to dataclass, just keep as dict list
+            self.touches = list(self._read_log())
+        except (OSError, ValueError):
+            self.touches = []
+    
+    def _migrate_legacy(self):
+        """Fold the legacy JSON file into the JSONL log, ahead of any appended touches."""
+        if not PATTERN_LOG_PATH.exists():
+            return
+        try:
+            with open(PATTERN_LOG_PATH, 'rb') as f:
+                legacy = _loads(f.read())
+            if not isinstance(legacy, list):
+                raise ValueError(f"expected a list of touches, got {type(legacy).__name__}")
+            appended = list(self._read_log())
+        except (OSError, ValueError) as e:
+            print(f"Legacy touch log not migrated: {e}")
+            return
+        self._rewrite(legacy + appended)
+        PATTERN_LOG_PATH.replace(PATTERN_LOG_PATH.with_suffix('.json.migrated'))
+    
+    def _read_log(self):
+        """Stream touches from the JSONL log, skipping malformed lines."""
+        if not PATTERN_JSONL_PATH.exists():
+            return
+        
+        with open(PATTERN_JSONL_PATH, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    continue
+    
+    def iter_touches(self):
+        """Yield every logged touch, streaming from disk if history wasn't loaded."""
+        if self._loaded:
+            yield from self.touches
+        else:
+            yield from self._read_log()
     
     def save(self):
-        """Save touches to file."""
-        with open(PATTERN_LOG_PATH, 'w') as f:
-            json.dump(self.touches, f, indent=2, default=str)
+        """Rewrite the full touch log from the loaded history."""
+        if not self._loaded:
+            # self.touches holds at most this session's touches; writing it
+            # would wipe the history on disk
+            raise RuntimeError("save() needs the touch history; create the logger without skip_load")
+        self._rewrite(self.touches)
+    
+    def _rewrite(self, touches: List[Dict]):
+        """Replace the touch log with `touches` (written aside, then swapped in)."""
+        tmp_path = PATTERN_JSONL_PATH.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.writelines(_dumps_line(touch) for touch in touches)
+        tmp_path.replace(PATTERN_JSONL_PATH)
+    
+    def append(self, touch_data: Dict):
+        """Append a single touch to the log."""
+        with open(PATTERN_JSONL_PATH, 'ab') as f:
+            f.write(_dumps_line(touch_data))
     
     def find_candle_index(self, timestamp: int) -> Optional[int]:
         """Find candle index closest to timestamp."""
@@ -259,8 +358,34 @@ class PatternTouchLogger:
             return None
         
         # Find closest timestamp
-        idx = (self.df['timestamp'] - timestamp).abs().idxmin()
-        return idx
+        return int(np.abs(self._ts - timestamp).argmin())
+    
+    def _candles(self, start: int, stop: int) -> List[Dict]:
+        """Build candle dicts for [start, stop) from the precomputed classification."""
+        return [
+            {
+                'type': PATTERN_TYPES[pid],
+                'is_bullish': bull,
+                'body_pct': bp,
+                'upper_wick_pct': up,
+                'lower_wick_pct': lo,
+                'body_size': body,
+                'range': rng,
+                'timestamp': ts,
+                'volume': vol,
+            }
+            for pid, bull, bp, up, lo, body, rng, ts, vol in zip(
+                self._pattern_ids[start:stop].tolist(),
+                self._is_bull[start:stop].tolist(),
+                self._body_pct[start:stop].tolist(),
+                self._up_pct[start:stop].tolist(),
+                self._low_pct[start:stop].tolist(),
+                self._body[start:stop].tolist(),
+                self._range[start:stop].tolist(),
+                self._ts[start:stop].tolist(),
+                self._v[start:stop].tolist(),
+            )
+        ]
     
     def analyze_touch(self, level_price: float, level_type: str, touch_timestamp: int) -> Optional[Dict]:
         """Analyze a level touch and return pattern data."""
@@ -269,50 +394,27 @@ class PatternTouchLogger:
         
         # Find touch candle index
         touch_idx = self.find_candle_index(touch_timestamp)
-        if touch_idx is None or touch_idx < 3 or touch_idx >= len(self.df) - 3:
+        n = len(self._c)
+        if touch_idx is None or touch_idx < 3 or touch_idx >= n - 3:
             return None
         
-        # Get candle data
-        pre_candles_raw = []
-        post_candles_raw = []
-        volumes = []
-        
-        # Pre-touch (3 candles before)
-        for i in range(touch_idx - 3, touch_idx):
-            row = self.df.iloc[i]
-            candle_info = classify_candle(row['open'], row['high'], row['low'], row['close'])
-            candle_info['timestamp'] = int(row['timestamp'])
-            candle_info['volume'] = float(row['volume'])
-            pre_candles_raw.append(candle_info)
-            volumes.append(row['volume'])
-        
-        # Touch candle
-        touch_row = self.df.iloc[touch_idx]
-        touch_candle = classify_candle(touch_row['open'], touch_row['high'], touch_row['low'], touch_row['close'])
-        touch_candle['timestamp'] = int(touch_row['timestamp'])
-        touch_candle['volume'] = float(touch_row['volume'])
-        volumes.append(touch_row['volume'])
-        
-        # Post-touch (3 candles after)
-        for i in range(touch_idx + 1, min(touch_idx + 4, len(self.df))):
-            row = self.df.iloc[i]
-            candle_info = classify_candle(row['open'], row['high'], row['low'], row['close'])
-            candle_info['timestamp'] = int(row['timestamp'])
-            candle_info['volume'] = float(row['volume'])
-            post_candles_raw.append(candle_info)
-            volumes.append(row['volume'])
+        # Pre-touch (3 candles before), touch candle, post-touch (3 candles after)
+        post_end = min(touch_idx + 4, n)
+        pre_candles_raw = self._candles(touch_idx - 3, touch_idx)
+        touch_candle = self._candles(touch_idx, touch_idx + 1)[0]
+        post_candles_raw = self._candles(touch_idx + 1, post_end)
+        volumes = self._v[touch_idx - 3:post_end].tolist()
         
         # Detect engulfing
-        prev_row = self.df.iloc[touch_idx - 1]
         engulfing = detect_engulfing(
             pre_candles_raw[-1], touch_candle,
-            prev_row['open'], prev_row['close'],
-            touch_row['open'], touch_row['close']
+            self._o[touch_idx - 1], self._c[touch_idx - 1],
+            self._o[touch_idx], self._c[touch_idx]
         )
         
         # Calculate momentum
-        pre_momentum = calculate_momentum(pre_candles_raw)
-        post_momentum = calculate_momentum(post_candles_raw)
+        pre_momentum = calculate_momentum(self._body[touch_idx - 3:touch_idx], self._is_bull[touch_idx - 3:touch_idx])
+        post_momentum = calculate_momentum(self._body[touch_idx + 1:post_end], self._is_bull[touch_idx + 1:post_end])
         
         # Volume cluster
         volume_cluster = analyze_volume_cluster(volumes, self.avg_volume)
@@ -321,10 +423,9 @@ class PatternTouchLogger:
         outcomes = {}
         for mins, label in [(5, '5m'), (15, '15m'), (30, '30m')]:
             end_idx = touch_idx + mins
-            if end_idx < len(self.df):
-                end_row = self.df.iloc[end_idx]
-                touch_close = touch_row['close']
-                end_close = end_row['close']
+            if end_idx < n:
+                touch_close = float(self._c[touch_idx])
+                end_close = float(self._c[end_idx])
                 change = end_close - touch_close
                 change_pct = (change / touch_close) * 100
                 
@@ -336,19 +437,19 @@ class PatternTouchLogger:
                     bounced = change < 0
                 
                 outcomes[label] = {
-                    'change': round(change, 2),
-                    'change_pct': round(change_pct, 4),
+                    'change': change,
+                    'change_pct': change_pct,
                     'bounced': bounced,
-                    'end_price': round(end_close, 2),
+                    'end_price': end_close,
                 }
         
         # Build touch record
         touch_data = {
             'timestamp': int(touch_timestamp),
             'datetime_str': datetime.fromtimestamp(touch_timestamp/1000, tz=timezone.utc).isoformat(),
-            'level_price': round(level_price, 2),
+            'level_price': level_price,
             'level_type': level_type,
-            'touch_price': round(touch_row['close'], 2),
+            'touch_price': float(self._c[touch_idx]),
             'pre_momentum': pre_momentum,
             'pre_candles': pre_candles_raw,
             'touch_candle': touch_candle,
@@ -361,91 +462,38 @@ class PatternTouchLogger:
             'outcome_30m': outcomes.get('30m'),
         }
         
-        self.touches.append(touch_data)
-        self.save()
+        if self._loaded:
+            self.touches.append(touch_data)
+        self.append(touch_data)
         
         return touch_data
     
     def get_pattern_stats(self) -> Dict:
         """Calculate statistics on pattern performance."""
-        if not self.touches:
+        # One pass to pull the grouping keys and the 15m outcome per touch
+        patterns, clusters, momenta, engulfing, bounced = [], [], [], [], []
+        try:
+            for t in self.iter_touches():
+                patterns.append((t.get('touch_candle') or {}).get('type', 'UNKNOWN'))
+                clusters.append((t.get('volume_cluster') or {}).get('cluster_type', 'UNKNOWN'))
+                momenta.append((t.get('pre_momentum') or {}).get('direction', 'UNKNOWN'))
+                engulfing.append('with_engulfing' if t.get('engulfing_pattern') else 'no_engulfing')
+                bounced.append(bool((t.get('outcome_15m') or {}).get('bounced')))
+        except (OSError, ValueError):
             return {}
         
-        stats = {
-            'total_touches': len(self.touches),
-            'by_pattern': {},
-            'by_volume_cluster': {},
-            'by_momentum': {},
-            'by_engulfing': {},
-        }
-        
-        # Group by touch candle pattern
-        pattern_outcomes = {}
-        for t in self.touches:
-            pattern = t.get('touch_candle', {}).get('type', 'UNKNOWN')
-            if pattern not in pattern_outcomes:
-                pattern_outcomes[pattern] = {'count': 0, 'bounces_15m': 0}
-            pattern_outcomes[pattern]['count'] += 1
-            if t.get('outcome_15m', {}).get('bounced'):
-                pattern_outcomes[pattern]['bounces_15m'] += 1
-        
-        for pattern, data in pattern_outcomes.items():
-            if data['count'] >= 3:
-                stats['by_pattern'][pattern] = {
-                    'count': data['count'],
-                    'bounce_rate': round(data['bounces_15m'] / data['count'] * 100, 1),
-                }
-        
-        # Group by volume cluster
-        vol_outcomes = {}
-        for t in self.touches:
-            cluster = t.get('volume_cluster', {}).get('cluster_type', 'UNKNOWN')
-            if cluster not in vol_outcomes:
-                vol_outcomes[cluster] = {'count': 0, 'bounces_15m': 0}
-            vol_outcomes[cluster]['count'] += 1
-            if t.get('outcome_15m', {}).get('bounced'):
-                vol_outcomes[cluster]['bounces_15m'] += 1
-        
-        for cluster, data in vol_outcomes.items():
-            if data['count'] >= 3:
-                stats['by_volume_cluster'][cluster] = {
-                    'count': data['count'],
-                    'bounce_rate': round(data['bounces_15m'] / data['count'] * 100, 1),
-                }
-        
-        # Group by pre-touch momentum
-        mom_outcomes = {}
-        for t in self.touches:
-            mom = t.get('pre_momentum', {}).get('direction', 'UNKNOWN')
-            if mom not in mom_outcomes:
-                mom_outcomes[mom] = {'count': 0, 'bounces_15m': 0}
-            mom_outcomes[mom]['count'] += 1
-            if t.get('outcome_15m', {}).get('bounced'):
-                mom_outcomes[mom]['bounces_15m'] += 1
-        
-        for mom, data in mom_outcomes.items():
-            if data['count'] >= 3:
-                stats['by_momentum'][mom] = {
-                    'count': data['count'],
-                    'bounce_rate': round(data['bounces_15m'] / data['count'] * 100, 1),
-                }
-        
-        # Engulfing patterns
-        eng_outcomes = {'with_engulfing': {'count': 0, 'bounces': 0}, 'no_engulfing': {'count': 0, 'bounces': 0}}
-        for t in self.touches:
-            key = 'with_engulfing' if t.get('engulfing_pattern') else 'no_engulfing'
-            eng_outcomes[key]['count'] += 1
-            if t.get('outcome_15m', {}).get('bounced'):
-                eng_outcomes[key]['bounces'] += 1
+        if not bounced:
+            return {}
         
-        for key, data in eng_outcomes.items():
-            if data['count'] >= 3:
-                stats['by_engulfing'][key] = {
-                    'count': data['count'],
-                    'bounce_rate': round(data['bounces'] / data['count'] * 100, 1),
-                }
+        bounced = np.asarray(bounced, dtype=np.float64)
         
-        return stats
+        return {
+            'total_touches': len(bounced),
+            'by_pattern': _bounce_rates(patterns, bounced),
+            'by_volume_cluster': _bounce_rates(clusters, bounced),
+            'by_momentum': _bounce_rates(momenta, bounced),
+            'by_engulfing': _bounce_rates(engulfing, bounced),
+        }
 
 
 def print_pattern_stats(stats: Dict):
@@ -484,19 +532,19 @@ def print_pattern_stats(stats: Dict):
 
 def main():
     """Run pattern analysis on existing data."""
-    logger = PatternTouchLogger()
+    logger = PatternTouchLogger(skip_load=True)
     
     print("=" * 70)
     print("  RAVEBEAR PATTERN TOUCH ANALYZER")
     print("=" * 70)
     
-    if not logger.touches:
+    stats = logger.get_pattern_stats()
+    if not stats:
         print("\nNo touches logged yet.")
         print("Touches will be logged automatically by the dashboard.")
-        print(f"\nData will be saved to: {PATTERN_LOG_PATH}")
+        print(f"\nData will be saved to: {PATTERN_JSONL_PATH}")
         return
     
-    stats = logger.get_pattern_stats()
     print_pattern_stats(stats)
     
     print("\n" + "=" * 70)
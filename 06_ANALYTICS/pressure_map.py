@@ -5,7 +5,9 @@ One-glance summary: where are the objects? Open air or minefield?
 
 import json
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 DATA_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\1m_Candles\BTC_USDT_SWAP_1m.parquet")
 OBJECTS_DIR = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Objects")
@@ -43,13 +45,19 @@ def load_all_prices():
                     prices.append({'price': b['high'], 'type': 'BOX', 'score': b.get('combined_score', 50)})
                     prices.append({'price': b['low'], 'type': 'BOX', 'score': b.get('combined_score', 50)})
     
-    # Origins
-    p = OBJECTS_DIR / "origins.json"
+    # Origins (Parquet: only the needed columns, ACTIVE rows filtered on read)
+    p = OBJECTS_DIR / "origins.parquet"
     if p.exists():
-        with open(p) as f:
-            for o in json.load(f).get('origins', []):
-                if o['state'] == 'ACTIVE':
-                    prices.append({'price': o['zone_mid'], 'type': 'ORIGIN', 'score': o.get('combined_score', 50)})
+        table = pq.read_table(p, columns=['zone_mid', 'combined_score'], filters=[('state', '==', 'ACTIVE')])
+        for mid, score in zip(table.column('zone_mid').to_pylist(), table.column('combined_score').to_pylist()):
+            prices.append({'price': mid, 'type': 'ORIGIN', 'score': score})
+    else:
+        p = OBJECTS_DIR / "origins.json"
+        if p.exists():
+            with open(p) as f:
+                for o in json.load(f).get('origins', []):
+                    if o['state'] == 'ACTIVE':
+                        prices.append({'price': o['zone_mid'], 'type': 'ORIGIN', 'score': o.get('combined_score', 50)})
     
     return prices
 
@@ -57,38 +65,41 @@ def load_all_prices():
 def calc_pressure(objects, current_price, atr=100):
     """Calculate pressure above and below current price."""
     
-    above = [o for o in objects if o['price'] > current_price]
-    below = [o for o in objects if o['price'] < current_price]
+    # Sort once; every band count is then a pair of binary searches
+    raw = np.fromiter((o['price'] for o in objects), dtype=np.float64, count=len(objects))
+    order = np.argsort(raw, kind='stable')
+    prices = raw[order]
     
-    # Count within ATR bands
-    above_025 = [o for o in above if o['price'] <= current_price + atr * 0.25]
-    above_050 = [o for o in above if o['price'] <= current_price + atr * 0.5]
-    above_100 = [o for o in above if o['price'] <= current_price + atr]
+    lo = np.searchsorted(prices, current_price, 'left')   # first price >= current
+    hi = np.searchsorted(prices, current_price, 'right')  # first price > current
     
-    below_025 = [o for o in below if o['price'] >= current_price - atr * 0.25]
-    below_050 = [o for o in below if o['price'] >= current_price - atr * 0.5]
-    below_100 = [o for o in below if o['price'] >= current_price - atr]
+    def count_above(offset):
+        return int(np.searchsorted(prices, current_price + offset, 'right') - hi)
     
-    # Nearest objects
-    above_sorted = sorted(above, key=lambda x: x['price'])
-    below_sorted = sorted(below, key=lambda x: x['price'], reverse=True)
+    def count_below(offset):
+        return int(lo - np.searchsorted(prices, current_price - offset, 'left'))
     
-    nearest_above = above_sorted[:3] if above_sorted else []
-    nearest_below = below_sorted[:3] if below_sorted else []
+    # Nearest objects
+    nearest_above = [objects[i] for i in order[hi:hi + 3]]
+    # Reversing the ascending order would also reverse ties; a stable sort
+    # on the negated prices keeps equal prices in their original order
+    desc = np.argsort(-raw, kind='stable')
+    first_below = len(raw) - lo
+    nearest_below = [objects[i] for i in desc[first_below:first_below + 3]]
     
     return {
         'above': {
-            'total': len(above),
-            'within_025_atr': len(above_025),
-            'within_050_atr': len(above_050),
-            'within_100_atr': len(above_100),
+            'total': int(len(prices) - hi),
+            'within_025_atr': count_above(atr * 0.25),
+            'within_050_atr': count_above(atr * 0.5),
+            'within_100_atr': count_above(atr),
             'nearest_3': [{'price': o['price'], 'type': o['type'], 'dist': o['price'] - current_price} for o in nearest_above],
         },
         'below': {
-            'total': len(below),
-            'within_025_atr': len(below_025),
-            'within_050_atr': len(below_050),
-            'within_100_atr': len(below_100),
+            'total': int(lo),
+            'within_025_atr': count_below(atr * 0.25),
+            'within_050_atr': count_below(atr * 0.5),
+            'within_100_atr': count_below(atr),
             'nearest_3': [{'price': o['price'], 'type': o['type'], 'dist': current_price - o['price']} for o in nearest_below],
         }
     }
@@ -1,8 +1,29 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from typing import List
 
-@dataclass
+# Column layout of a batch of WickFeatures (one record per wick). Scores live
+# on a 0-100 scale, so float32 is plenty and halves the memory per column.
+FEATURE_DTYPE = np.dtype([
+    ('wick_size_pct', 'f4'),
+    ('body_size_pct', 'f4'),
+    ('wick_to_body_ratio', 'f4'),
+    ('rejection_velocity', 'f4'),
+    ('imbalance_trap_score', 'f4'),
+    ('l5_depth_bid', 'f4'),
+    ('l5_depth_ask', 'f4'),
+    ('depth_imbalance', 'f4'),
+    ('oi_change_pct', 'f4'),
+    ('vwap_mean_reversion_score', 'f4'),
+    ('fresh_sd_zone_flag', '?'),
+    ('delta_divergence_flag', '?'),
+    ('absorption_flag', '?'),
+])
+
+@dataclass(slots=True)
 class WickFeatures:
     # Geometry
     wick_size_pct: float = 0.0
@@ -29,28 +50,155 @@ class WickFeatures:
     delta_divergence_flag: bool = False
     absorption_flag: bool = False
 
-@dataclass
+    def to_record(self) -> np.void:
+        """This wick as one FEATURE_DTYPE record."""
+        return np.array(tuple(getattr(self, name) for name in FEATURE_DTYPE.names), dtype=FEATURE_DTYPE)[()]
+
+    @classmethod
+    def from_record(cls, rec: np.void) -> 'WickFeatures':
+        return cls(**{name: rec[name].item() for name in FEATURE_DTYPE.names})
+
+    @staticmethod
+    def to_array(features: List['WickFeatures']) -> np.ndarray:
+        """Pack many wicks into a FEATURE_DTYPE array (one contiguous column per field)."""
+        return np.array(
+            [tuple(getattr(f, name) for name in FEATURE_DTYPE.names) for f in features],
+            dtype=FEATURE_DTYPE,
+        )
+
+@dataclass(slots=True)
 class WickEvent:
     symbol: str
     wick_side: str # "upper" or "lower"
     price: float
     features: WickFeatures
 
+SCORE_COMPONENTS = (
+    'virgin_status', 'distance', 'approach_velocity', 'sweep_probability',
+    'liquidity_density', 'vwap_alignment', 'oi_conviction', 'age_maturity',
+)
+
+# Components that do not depend on the wick (virgin, distance, liquidity, OI, age)
+_FIXED_SCORES = {
+    'virgin_status': 15,
+    'distance': 20,
+    'liquidity_density': 5,
+    'oi_conviction': 0,
+    'age_maturity': 1,
+}
+_CONST_SCORE = sum(_FIXED_SCORES.values())  # 41
+
+# Wick-dependent components, shared by the scalar and batch scoring paths
+_VELOCITY_MAX = 20        # approach_velocity cap (pts)
+_VELOCITY_FULL = 2.0      # rejection velocity (pts/min) that earns the cap
+_SWEEP_MAX = 15           # sweep_probability at imbalance_trap_score 100
+_VWAP_TIERS = ((70, 10), (40, 5))  # (deviation score above, pts), first match wins
+
+# Confidence: base plus a bonus for high volume and for a high score
+_CONF_BASE = 50.0
+_CONF_HIGH_VOLUME = (80, 20)  # (imbalance_trap_score above, bonus)
+_CONF_HIGH_SCORE = (70, 20)   # (magnet score above, bonus)
+
+class OnlineMean:
+    """Rolling mean over the last n values, O(1) per update (running sum + ring buffer)."""
+    
+    __slots__ = ('n', 'buf', 'i', 'sum', 'filled')
+    
+    def __init__(self, n: int):
+        self.n = n
+        self.buf = [0.0] * n
+        self.i = 0
+        self.sum = 0.0
+        self.filled = 0
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.filled if self.filled else float('nan')
+    
+    def update(self, x: float) -> float:
+        """Push x, evicting the oldest value once full; returns the new mean."""
+        self.sum += x - self.buf[self.i]
+        self.buf[self.i] = x
+        self.i = (self.i + 1) % self.n
+        self.filled = min(self.filled + 1, self.n)
+        return self.sum / self.filled
+
+
 class HardenedWickScorer:
     """
     Ported scoring logic from ALPHA system, adapted for Hardened 1m candles.
     """
     
-    def extract_features(self, candle: pd.Series, history: pd.DataFrame) -> WickFeatures:
-        """Calculate features from OHLCV data."""
+    def __init__(self):
+        # Live-stream state for extract_features_live
+        self._live_vol = OnlineMean(20)
+        self._live_close = OnlineMean(20)
+        self._live_seen = 0
+    
+    def prepare_history(self, history: pd.DataFrame) -> dict:
+        """Precompute per-candle inputs for extract_features in one pass.
+        
+        Holds the OHLCV columns as float64 arrays plus the 20-bar volume and
+        close means, where index i is the mean of the 20 candles before i.
+        """
+        precomputed = {
+            name: history[name].to_numpy(dtype=np.float64)
+            for name in ('open', 'high', 'low', 'close', 'volume')
+        }
+        precomputed['vol_ma20'] = history['volume'].rolling(20).mean().shift(1).to_numpy(dtype=np.float64)
+        precomputed['close_ma20'] = history['close'].rolling(20).mean().shift(1).to_numpy(dtype=np.float64)
+        return precomputed
+
+    def extract_features(self, candle_idx: int, precomputed: dict) -> WickFeatures:
+        """Calculate features for one candle of a prepare_history() frame."""
+        return self.extract_features_scalar(
+            precomputed['open'][candle_idx], precomputed['high'][candle_idx],
+            precomputed['low'][candle_idx], precomputed['close'][candle_idx],
+            precomputed['volume'][candle_idx], precomputed['vol_ma20'][candle_idx],
+            precomputed['close_ma20'][candle_idx], candle_idx,
+        )
+
+    def extract_all_features(self, precomputed: dict) -> List[WickFeatures]:
+        """Calculate features for every candle of a prepare_history() frame.
+        
+        Columns are converted to Python lists once so the per-candle work
+        is plain float arithmetic instead of numpy scalar indexing.
+        """
+        cols = {name: np.asarray(values).tolist() for name, values in precomputed.items()}
+        return [
+            self.extract_features_scalar(o, h, l, c, v, vol_ma, close_ma, i)
+            for i, (o, h, l, c, v, vol_ma, close_ma) in enumerate(zip(
+                cols['open'], cols['high'], cols['low'], cols['close'], cols['volume'],
+                cols['vol_ma20'], cols['close_ma20']))
+        ]
+
+    def extract_features_live(self, open_: float, high: float, low: float, close: float,
+                              vol: float) -> WickFeatures:
+        """Calculate features for the next candle of a live stream.
+        
+        Same result as extract_features on the full history, but the 20-bar
+        means are kept as online state, so each candle costs O(1).
+        """
+        # Means of the 20 candles before this one
+        f = self.extract_features_scalar(open_, high, low, close, vol, self._live_vol.mean,
+                                         self._live_close.mean, self._live_seen)
+        
+        self._live_vol.update(vol)
+        self._live_close.update(close)
+        self._live_seen += 1
+        return f
+
+    def extract_features_scalar(self, open_: float, high: float, low: float, close: float,
+                                vol: float, vol_ma20: float, close_ma20: float,
+                                candle_idx: int) -> WickFeatures:
+        """Calculate features from one candle's OHLCV scalars.
+        
+        vol_ma20/close_ma20 are the means of the 20 candles before this one
+        and candle_idx is the candle's position in its history.
+        """
         f = WickFeatures()
         
         # Geometry
-        open_ = candle['open']
-        close = candle['close']
-        high = candle['high']
-        low = candle['low']
-        
         range_len = high - low
         body_len = abs(close - open_)
         
@@ -60,11 +208,12 @@ class HardenedWickScorer:
         f.body_size_pct = (body_len / open_) * 100
         
         # Determine side and size
-        if high - max(open_, close) > min(open_, close) - low:
-            # Upper wick dominance
-            wick_len = high - max(open_, close)
-        else:
-            wick_len = min(open_, close) - low
+        body_top = max(open_, close)
+        body_bottom = min(open_, close)
+        upper_wick = high - body_top
+        lower_wick = body_bottom - low
+        # Upper wick dominance, else lower
+        wick_len = upper_wick if upper_wick > lower_wick else lower_wick
             
         f.wick_size_pct = (wick_len / open_) * 100
         f.wick_to_body_ratio = wick_len / max(body_len, 0.00000001)
@@ -74,11 +223,9 @@ class HardenedWickScorer:
         f.rejection_velocity = wick_len / 60.0 
         
         # Trap/Sweep Proxy (Relative Volume)
-        vol = candle['volume']
-        # Calculate avg volume of last 20 candles
-        if len(history) > 20:
-            avg_vol = history['volume'].iloc[-20:].mean()
-            rel_vol = vol / max(avg_vol, 1)
+        # Avg volume of last 20 candles (needs more than 20 candles of history)
+        if candle_idx > 20:
+            rel_vol = vol / max(vol_ma20, 1)
             # Map RelVol 1.0 -> 50 score, 3.0 -> 100 score
             f.imbalance_trap_score = min(100, rel_vol * 33)
         else:
@@ -86,9 +233,8 @@ class HardenedWickScorer:
             
         # VWAP/Trend Proxy
         # Distance from 20 SMA
-        if len(history) > 20:
-            sma = history['close'].iloc[-20:].mean()
-            dist_pct = abs(close - sma) / sma
+        if candle_idx > 20:
+            dist_pct = abs(close - close_ma20) / close_ma20
             # 2% deviation = 100 score
             f.vwap_mean_reversion_score = min(100, (dist_pct / 0.02) * 100)
         
@@ -98,55 +244,117 @@ class HardenedWickScorer:
         
         return f
 
-    def score_wick(self, wick: WickEvent) -> dict:
-        """Compute Wick Magnet Score (0-100)"""
+    def score_wick(self, wick: WickEvent, include_breakdown: bool = True) -> dict:
+        """Compute Wick Magnet Score (0-100)
+        
+        Scalar fast path: only velocity, sweep and VWAP depend on the wick,
+        the other components are folded into _CONST_SCORE. Same constants
+        and thresholds as score_wicks_batch. Pass include_breakdown=False to
+        skip building the per-component dict.
+        """
         f = wick.features
-        scores = {}
         
-        # 1. Virgin Status (15 pts) - Always fresh in this factory
-        scores['virgin_status'] = 15
+        velocity_score = min(_VELOCITY_MAX, (f.rejection_velocity / _VELOCITY_FULL) * _VELOCITY_MAX)
+        sweep_score = (f.imbalance_trap_score / 100) * _SWEEP_MAX
+        vwap_score = 0
+        for threshold, pts in _VWAP_TIERS:
+            if f.vwap_mean_reversion_score > threshold:
+                vwap_score = pts
+                break
         
-        # 2. Distance (20 pts) - Currently at price
-        scores['distance'] = 20
+        total_score = _CONST_SCORE + velocity_score + sweep_score + vwap_score
         
+        result = {
+            "magnet_score": round(total_score, 2),
+            "confidence": self._compute_confidence(f, total_score)
+        }
+        if include_breakdown:
+            result["breakdown"] = {
+                **_FIXED_SCORES,
+                'approach_velocity': velocity_score,
+                'sweep_probability': sweep_score,
+                'vwap_alignment': vwap_score,
+            }
+        return result
+
+    def score_wicks_batch(self, features) -> pd.DataFrame:
+        """Compute Wick Magnet Scores for many wicks in one vectorized pass.
+        
+        features: FEATURE_DTYPE array (see WickFeatures.to_array), DataFrame
+        or any column mapping with rejection_velocity, imbalance_trap_score
+        and vwap_mean_reversion_score columns.
+        Returns one row per wick: the score breakdown, magnet_score and confidence.
+        """
+        rej_vel = np.asarray(features['rejection_velocity'], dtype=np.float64)
+        imb = np.asarray(features['imbalance_trap_score'], dtype=np.float64)
+        vwap_score = np.asarray(features['vwap_mean_reversion_score'], dtype=np.float64)
+        
+        index = features.index if isinstance(features, pd.DataFrame) else pd.RangeIndex(len(rej_vel))
+        components, total_score = self._score_components(rej_vel, imb, vwap_score)
+        scores = pd.DataFrame({name: components[name] for name in SCORE_COMPONENTS}, index=index)
+        
+        scores['magnet_score'] = np.round(total_score, 2)
+        scores['confidence'] = self._compute_confidence_batch(imb, total_score)
+        return scores
+
+    def _score_components(self, rej_vel: np.ndarray, imb: np.ndarray, vwap_score: np.ndarray):
+        """Score every component from the wick-dependent feature columns.
+        
+        Vectorized counterpart of score_wick, used by score_wicks_batch.
+        Returns (components, total_score); the fixed components come from
+        _FIXED_SCORES and are summed in _CONST_SCORE.
+        """
         # 3. Approach Velocity (20 pts) - Scaled 0-20
         # Normalizing: 50 points/min = max score?
         # BTC Price ~90k. 50 pts is small.
         # Let's say 0.1% move in 1 min is fast.
         # 90k * 0.001 = 90 points.
-        velocity_score = min(20, (f.rejection_velocity / 2.0) * 20) 
-        scores['approach_velocity'] = velocity_score
+        velocity_score = np.minimum(_VELOCITY_MAX, (rej_vel / _VELOCITY_FULL) * _VELOCITY_MAX)
         
         # 4. Sweep Probability (15 pts) - Based on Volume
-        scores['sweep_probability'] = (f.imbalance_trap_score / 100) * 15
-        
-        # 5. Liquidity Density (10 pts) - Neutral
-        scores['liquidity_density'] = 5
+        sweep_score = (imb / 100) * _SWEEP_MAX
         
         # 6. VWAP Alignment (10 pts)
-        if f.vwap_mean_reversion_score > 70:
-            scores['vwap_alignment'] = 10
-        elif f.vwap_mean_reversion_score > 40:
-            scores['vwap_alignment'] = 5
-        else:
-            scores['vwap_alignment'] = 0
-            
-        # 7. OI Conviction (5 pts) - Neutral
-        scores['oi_conviction'] = 0
-        
-        # 8. Age (5 pts) - New
-        scores['age_maturity'] = 1
-        
-        total_score = sum(scores.values())
+        vwap_alignment = np.select(
+            [vwap_score > threshold for threshold, _ in _VWAP_TIERS],
+            [pts for _, pts in _VWAP_TIERS],
+            default=0,
+        )
         
-        return {
-            "magnet_score": round(total_score, 2),
-            "breakdown": scores,
-            "confidence": self._compute_confidence(f, total_score)
+        components = {
+            **_FIXED_SCORES,
+            'approach_velocity': velocity_score,
+            'sweep_probability': sweep_score,
+            'vwap_alignment': vwap_alignment,
         }
+        return components, _CONST_SCORE + velocity_score + sweep_score + vwap_alignment
 
     def _compute_confidence(self, f: WickFeatures, score: float) -> float:
-        conf = 50.0
-        if f.imbalance_trap_score > 80: conf += 20 # High volume
-        if score > 70: conf += 20
+        conf = _CONF_BASE
+        if f.imbalance_trap_score > _CONF_HIGH_VOLUME[0]: conf += _CONF_HIGH_VOLUME[1] # High volume
+        if score > _CONF_HIGH_SCORE[0]: conf += _CONF_HIGH_SCORE[1]
         return min(100.0, conf)
+
+    def _compute_confidence_batch(self, imbalance_trap_score: np.ndarray, score: np.ndarray) -> np.ndarray:
+        conf = _CONF_BASE + np.where(imbalance_trap_score > _CONF_HIGH_VOLUME[0], _CONF_HIGH_VOLUME[1], 0)  # High volume
+        conf += np.where(score > _CONF_HIGH_SCORE[0], _CONF_HIGH_SCORE[1], 0)
+        return np.minimum(100.0, conf)
+
+
+def score_symbol(history: pd.DataFrame) -> pd.DataFrame:
+    """Score every candle of one symbol's OHLCV history (one row per candle)."""
+    scorer = HardenedWickScorer()
+    features = scorer.extract_all_features(scorer.prepare_history(history))
+    scores = scorer.score_wicks_batch(WickFeatures.to_array(features))
+    scores.index = history.index
+    return scores
+
+
+def score_symbols(symbol_dfs: dict, max_workers: int = None) -> dict:
+    """Score many symbols at once, one worker process per symbol.
+    
+    Scoring is CPU-bound pure Python/numpy, so processes sidestep the GIL.
+    Callers on Windows must run this under an `if __name__ == '__main__':` guard.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        return dict(zip(symbol_dfs, ex.map(score_symbol, symbol_dfs.values())))
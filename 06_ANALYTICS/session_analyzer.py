@@ -5,9 +5,9 @@ Works with timestamped session data from MasterDataCollector.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from collections import defaultdict
 
 try:
     import pandas as pd
@@ -16,14 +16,41 @@ except ImportError:
     print("pip install pandas numpy")
     exit(1)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 SESSIONS_DIR = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Sessions")
 OUTPUT_DIR = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Analysis")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Snapshot files are small; reads are I/O-bound so threads overlap the disk latency
+READ_WORKERS = 16
+
+
+def _read_json(path: Path):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
+
+
+def _load_tagged(job):
+    """Read one JSON file and tag it with where it came from."""
+    path, key, value = job
+    data = _read_json(path)
+    data[key] = value
+    return data
+
+
+def _load_many(jobs):
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as ex:
+        return list(ex.map(_load_tagged, jobs))
+
 
 def load_all_sessions():
     """Load all session data."""
-    sessions = []
+    jobs = []
     
     for session_dir in sorted(SESSIONS_DIR.iterdir()):
         if not session_dir.is_dir():
@@ -31,17 +58,14 @@ def load_all_sessions():
         
         session_file = session_dir / "session_data.json"
         if session_file.exists():
-            with open(session_file) as f:
-                data = json.load(f)
-                data['_dir'] = str(session_dir)
-                sessions.append(data)
+            jobs.append((session_file, '_dir', str(session_dir)))
     
-    return sessions
+    return _load_many(jobs)
 
 
 def load_all_snapshots():
     """Load all snapshots from all sessions."""
-    snapshots = []
+    jobs = []
     
     for session_dir in sorted(SESSIONS_DIR.iterdir()):
         if not session_dir.is_dir():
@@ -52,157 +76,138 @@ def load_all_snapshots():
             continue
         
         for snap_file in sorted(snap_dir.glob("snap_*.json")):
-            with open(snap_file) as f:
-                snap = json.load(f)
-                snap['_session'] = session_dir.name
-                snapshots.append(snap)
+            jobs.append((snap_file, '_session', session_dir.name))
     
-    return snapshots
+    return _load_many(jobs)
 
 
-def analyze_regimes(snapshots):
+def build_snapshot_frame(snapshots):
+    """Flatten snapshots into one DataFrame (nested keys become 'a.b' columns).
+    
+    Fields the analyses read are filled with the same defaults the
+    snapshot dicts used to fall back to, and regime becomes a categorical.
+    'chg' is the % BTC move to the next snapshot, computed once for every
+    analysis; it is NaN where either price is zero or missing, so gaps
+    are never bridged.
+    """
+    df = pd.json_normalize(snapshots, sep='.')
+    
+    defaults = {
+        'btc_price': np.nan,
+        'whale_flow.btc_net_flow': 0,
+        'derivatives.funding_rate': 0,
+        'derivatives.long_pct': 50,
+        'objects.wicks_above': 0,
+        'objects.poors_above': 0,
+        'objects.wicks_below': 0,
+        'objects.poors_below': 0,
+    }
+    for col, default in defaults.items():
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(default)
+        else:
+            df[col] = float(default)
+    
+    regime = df['regime'] if 'regime' in df else pd.Series(None, index=df.index, dtype=object)
+    df['regime'] = regime.fillna('UNKNOWN').astype('category')
+    
+    price = df['btc_price'].where(df['btc_price'] != 0)
+    df['btc_price'] = price
+    df['chg'] = ((price.shift(-1) - price) / price) * 100
+    return df
+
+
+def _bucket_stats(buckets, chg, min_count, order=None):
+    """Count / avg change / up% per bucket, skipping buckets under min_count.
+    
+    Rows with no next-snapshot change are ignored. Buckets come back in
+    `order` if given, else by count (largest first).
+    """
+    frame = pd.DataFrame({'bucket': buckets, 'chg': chg}).dropna(subset=['chg'])
+    frame['up'] = frame['chg'] > 0
+    
+    stats = frame.groupby('bucket', sort=False, observed=True).agg(
+        count=('chg', 'size'), avg=('chg', 'mean'), up_pct=('up', 'mean'))
+    stats['up_pct'] *= 100
+    
+    if order is not None:
+        stats = stats.reindex([b for b in order if b in stats.index])
+    else:
+        stats = stats.sort_values('count', ascending=False, kind='stable')
+    
+    stats = stats[stats['count'] >= min_count]
+    return list(zip(stats.index, stats['count'].astype(int), stats['avg'], stats['up_pct']))
+
+
+def analyze_regimes(df):
     """Analyze price outcomes by regime."""
-    print("\n" + "=" * 70)
-    print("  REGIME ANALYSIS")
-    print("=" * 70)
-    
-    if len(snapshots) < 5:
-        print("  Need more snapshots for analysis")
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("  REGIME ANALYSIS")
+    lines.append("=" * 70)
+    
+    if len(df) < 5:
+        lines.append("  Need more snapshots for analysis")
+        print("\n".join(lines))
         return
     
     # Group by regime
-    regime_outcomes = defaultdict(list)
+    lines.append(f"\n  {'REGIME':<50} {'COUNT':>6} {'UP%':>8} {'AVG CHG':>10}")
+    lines.append("  " + "-" * 76)
     
-    for i in range(len(snapshots) - 1):
-        current = snapshots[i]
-        next_snap = snapshots[i + 1]
-        
-        regime = current.get('regime', 'UNKNOWN')
-        current_price = current.get('btc_price', 0)
-        next_price = next_snap.get('btc_price', 0)
-        
-        if current_price and next_price:
-            change_pct = ((next_price - current_price) / current_price) * 100
-            regime_outcomes[regime].append({
-                'change_pct': change_pct,
-                'went_up': change_pct > 0,
-            })
-    
-    print(f"\n  {'REGIME':<50} {'COUNT':>6} {'UP%':>8} {'AVG CHG':>10}")
-    print("  " + "-" * 76)
-    
-    for regime, outcomes in sorted(regime_outcomes.items(), key=lambda x: len(x[1]), reverse=True):
-        if len(outcomes) < 3:
-            continue
-        
-        count = len(outcomes)
-        up_pct = sum(1 for o in outcomes if o['went_up']) / count * 100
-        avg_chg = np.mean([o['change_pct'] for o in outcomes])
-        
-        print(f"  {regime:<50} {count:>6} {up_pct:>7.1f}% {avg_chg:>+9.4f}%")
+    for regime, count, avg_chg, up_pct in _bucket_stats(df['regime'], df['chg'], min_count=3):
+        lines.append(f"  {regime:<50} {count:>6} {up_pct:>7.1f}% {avg_chg:>+9.4f}%")
+    
+    print("\n".join(lines))
 
 
-def analyze_whale_correlation(snapshots):
+def analyze_whale_correlation(df):
     """Analyze whale flow vs price movement."""
-    print("\n" + "=" * 70)
-    print("  WHALE FLOW CORRELATION")
-    print("=" * 70)
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("  WHALE FLOW CORRELATION")
+    lines.append("=" * 70)
     
-    whale_outcomes = {
-        'inflow': [],   # Net positive = to exchanges
-        'outflow': [],  # Net negative = from exchanges
-        'neutral': [],
-    }
+    net_flow = df['whale_flow.btc_net_flow'].to_numpy()
     
-    for i in range(len(snapshots) - 1):
-        current = snapshots[i]
-        next_snap = snapshots[i + 1]
-        
-        whale = current.get('whale_flow', {})
-        net_flow = whale.get('btc_net_flow', 0)
-        
-        current_price = current.get('btc_price', 0)
-        next_price = next_snap.get('btc_price', 0)
-        
-        if current_price and next_price:
-            change_pct = ((next_price - current_price) / current_price) * 100
-            
-            if net_flow > 5_000_000:
-                whale_outcomes['inflow'].append(change_pct)
-            elif net_flow < -5_000_000:
-                whale_outcomes['outflow'].append(change_pct)
-            else:
-                whale_outcomes['neutral'].append(change_pct)
-    
-    print(f"\n  {'WHALE STATE':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
-    print("  " + "-" * 50)
-    
-    for state, changes in whale_outcomes.items():
-        if len(changes) < 3:
-            continue
-        
-        count = len(changes)
-        avg = np.mean(changes)
-        up_pct = sum(1 for c in changes if c > 0) / count * 100
-        
+    # Net positive = to exchanges, net negative = from exchanges
+    states = np.select([net_flow > 5_000_000, net_flow < -5_000_000], ['inflow', 'outflow'], default='neutral')
+    
+    lines.append(f"\n  {'WHALE STATE':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
+    lines.append("  " + "-" * 50)
+    
+    for state, count, avg, up_pct in _bucket_stats(states, df['chg'], min_count=3, order=['inflow', 'outflow', 'neutral']):
         signal = ""
         if state == 'inflow' and avg < 0:
             signal = " <- CONFIRMED BEARISH"
         elif state == 'outflow' and avg > 0:
             signal = " <- CONFIRMED BULLISH"
         
-        print(f"  {state.upper():<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+        lines.append(f"  {state.upper():<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+    
+    print("\n".join(lines))
+
 
+FUNDING_LEVELS = ['extreme_negative', 'negative', 'neutral', 'positive', 'extreme_positive']
+LS_LEVELS = ['very_short_heavy', 'short_heavy', 'balanced', 'long_heavy', 'very_long_heavy']
 
-def analyze_funding_extremes(snapshots):
+
+def analyze_funding_extremes(df):
     """Analyze outcomes after extreme funding."""
-    print("\n" + "=" * 70)
-    print("  FUNDING EXTREME ANALYSIS")
-    print("=" * 70)
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("  FUNDING EXTREME ANALYSIS")
+    lines.append("=" * 70)
     
-    funding_outcomes = {
-        'extreme_positive': [],  # > 0.05%
-        'positive': [],          # 0.01% to 0.05%
-        'neutral': [],           # -0.01% to 0.01%
-        'negative': [],          # -0.05% to -0.01%
-        'extreme_negative': [],  # < -0.05%
-    }
+    funding = df['derivatives.funding_rate'].to_numpy() * 100  # Convert to %
     
-    for i in range(len(snapshots) - 1):
-        current = snapshots[i]
-        next_snap = snapshots[i + 1]
-        
-        deriv = current.get('derivatives', {})
-        funding = deriv.get('funding_rate', 0) * 100  # Convert to %
-        
-        current_price = current.get('btc_price', 0)
-        next_price = next_snap.get('btc_price', 0)
-        
-        if current_price and next_price:
-            change_pct = ((next_price - current_price) / current_price) * 100
-            
-            if funding > 0.05:
-                funding_outcomes['extreme_positive'].append(change_pct)
-            elif funding > 0.01:
-                funding_outcomes['positive'].append(change_pct)
-            elif funding > -0.01:
-                funding_outcomes['neutral'].append(change_pct)
-            elif funding > -0.05:
-                funding_outcomes['negative'].append(change_pct)
-            else:
-                funding_outcomes['extreme_negative'].append(change_pct)
-    
-    print(f"\n  {'FUNDING LEVEL':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
-    print("  " + "-" * 50)
-    
-    for level, changes in funding_outcomes.items():
-        if len(changes) < 2:
-            continue
-        
-        count = len(changes)
-        avg = np.mean(changes)
-        up_pct = sum(1 for c in changes if c > 0) / count * 100
-        
+    # > 0.05% extreme positive ... < -0.05% extreme negative (right-closed bins)
+    levels = pd.cut(funding, bins=[-np.inf, -0.05, -0.01, 0.01, 0.05, np.inf], labels=FUNDING_LEVELS)
+    
+    lines.append(f"\n  {'FUNDING LEVEL':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
+    lines.append("  " + "-" * 50)
+    
+    for level, count, avg, up_pct in _bucket_stats(levels, df['chg'], min_count=2, order=FUNDING_LEVELS[::-1]):
         # Expected: extreme positive funding -> price should drop (long squeeze)
         signal = ""
         if level == 'extreme_positive' and avg < 0:
@@ -210,58 +215,27 @@ def analyze_funding_extremes(snapshots):
         elif level == 'extreme_negative' and avg > 0:
             signal = " <- SQUEEZE CONFIRMED"
         
-        print(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+        lines.append(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+    
+    print("\n".join(lines))
 
 
-def analyze_ls_extremes(snapshots):
+def analyze_ls_extremes(df):
     """Analyze outcomes after extreme L/S ratios."""
-    print("\n" + "=" * 70)
-    print("  LONG/SHORT RATIO ANALYSIS")
-    print("=" * 70)
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("  LONG/SHORT RATIO ANALYSIS")
+    lines.append("=" * 70)
     
-    ls_outcomes = {
-        'very_long_heavy': [],   # > 70%
-        'long_heavy': [],        # 60-70%
-        'balanced': [],          # 40-60%
-        'short_heavy': [],       # 30-40%
-        'very_short_heavy': [],  # < 30%
-    }
+    long_pct = df['derivatives.long_pct'].to_numpy()
     
-    for i in range(len(snapshots) - 1):
-        current = snapshots[i]
-        next_snap = snapshots[i + 1]
-        
-        deriv = current.get('derivatives', {})
-        long_pct = deriv.get('long_pct', 50)
-        
-        current_price = current.get('btc_price', 0)
-        next_price = next_snap.get('btc_price', 0)
-        
-        if current_price and next_price:
-            change_pct = ((next_price - current_price) / current_price) * 100
-            
-            if long_pct > 70:
-                ls_outcomes['very_long_heavy'].append(change_pct)
-            elif long_pct > 60:
-                ls_outcomes['long_heavy'].append(change_pct)
-            elif long_pct > 40:
-                ls_outcomes['balanced'].append(change_pct)
-            elif long_pct > 30:
-                ls_outcomes['short_heavy'].append(change_pct)
-            else:
-                ls_outcomes['very_short_heavy'].append(change_pct)
-    
-    print(f"\n  {'L/S LEVEL':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
-    print("  " + "-" * 50)
-    
-    for level, changes in ls_outcomes.items():
-        if len(changes) < 2:
-            continue
-        
-        count = len(changes)
-        avg = np.mean(changes)
-        up_pct = sum(1 for c in changes if c > 0) / count * 100
-        
+    # > 70% very long heavy ... < 30% very short heavy (right-closed bins)
+    levels = pd.cut(long_pct, bins=[-np.inf, 30, 40, 60, 70, np.inf], labels=LS_LEVELS)
+    
+    lines.append(f"\n  {'L/S LEVEL':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
+    lines.append("  " + "-" * 50)
+    
+    for level, count, avg, up_pct in _bucket_stats(levels, df['chg'], min_count=2, order=LS_LEVELS[::-1]):
         # Expected: very long heavy -> price should drop (hunt longs)
         signal = ""
         if level == 'very_long_heavy' and avg < 0:
@@ -269,56 +243,36 @@ def analyze_ls_extremes(snapshots):
         elif level == 'very_short_heavy' and avg > 0:
             signal = " <- SHORTS HUNTED"
         
-        print(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+        lines.append(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%{signal}")
+    
+    print("\n".join(lines))
 
 
-def analyze_object_density(snapshots):
+def analyze_object_density(df):
     """Analyze if object density correlates with price movement."""
-    print("\n" + "=" * 70)
-    print("  OBJECT DENSITY VS PRICE MOVEMENT")
-    print("=" * 70)
+    lines = []
+    lines.append("\n" + "=" * 70)
+    lines.append("  OBJECT DENSITY VS PRICE MOVEMENT")
+    lines.append("=" * 70)
     
-    density_outcomes = {
-        'high_above': [],   # Many objects above price
-        'high_below': [],   # Many objects below price
-        'balanced': [],     # Similar above/below
-    }
+    above = (df['objects.wicks_above'] + df['objects.poors_above']).to_numpy()
+    below = (df['objects.wicks_below'] + df['objects.poors_below']).to_numpy()
     
-    for i in range(len(snapshots) - 1):
-        current = snapshots[i]
-        next_snap = snapshots[i + 1]
-        
-        objects = current.get('objects', {})
-        above = objects.get('wicks_above', 0) + objects.get('poors_above', 0)
-        below = objects.get('wicks_below', 0) + objects.get('poors_below', 0)
-        
-        current_price = current.get('btc_price', 0)
-        next_price = next_snap.get('btc_price', 0)
-        
-        if current_price and next_price and (above + below) > 0:
-            change_pct = ((next_price - current_price) / current_price) * 100
-            
-            ratio = above / (above + below) if (above + below) > 0 else 0.5
-            
-            if ratio > 0.6:
-                density_outcomes['high_above'].append(change_pct)
-            elif ratio < 0.4:
-                density_outcomes['high_below'].append(change_pct)
-            else:
-                density_outcomes['balanced'].append(change_pct)
-    
-    print(f"\n  {'DENSITY BIAS':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
-    print("  " + "-" * 50)
-    
-    for level, changes in density_outcomes.items():
-        if len(changes) < 2:
-            continue
-        
-        count = len(changes)
-        avg = np.mean(changes)
-        up_pct = sum(1 for c in changes if c > 0) / count * 100
-        
-        print(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%")
+    # Snapshots with no objects on either side say nothing about density
+    total = above + below
+    chg = df['chg'].where(total > 0)
+    ratio = np.divide(above, total, out=np.full(len(total), 0.5), where=total > 0)
+    
+    # Many objects above price / many below / similar above and below
+    bias = np.select([ratio > 0.6, ratio < 0.4], ['high_above', 'high_below'], default='balanced')
+    
+    lines.append(f"\n  {'DENSITY BIAS':<20} {'COUNT':>8} {'AVG CHANGE':>12} {'UP%':>8}")
+    lines.append("  " + "-" * 50)
+    
+    for level, count, avg, up_pct in _bucket_stats(bias, chg, min_count=2, order=['high_above', 'high_below', 'balanced']):
+        lines.append(f"  {level:<20} {count:>8} {avg:>+11.4f}% {up_pct:>7.1f}%")
+    
+    print("\n".join(lines))
 
 
 def generate_report():
@@ -338,12 +292,13 @@ def generate_report():
         print("  Minimum 5 snapshots required for analysis.")
         return
     
-    # Run analyses
-    analyze_regimes(snapshots)
-    analyze_whale_correlation(snapshots)
-    analyze_funding_extremes(snapshots)
-    analyze_ls_extremes(snapshots)
-    analyze_object_density(snapshots)
+    # Run analyses on one flattened frame
+    df = build_snapshot_frame(snapshots)
+    analyze_regimes(df)
+    analyze_whale_correlation(df)
+    analyze_funding_extremes(df)
+    analyze_ls_extremes(df)
+    analyze_object_density(df)
     
     print("\n" + "=" * 70)
     print("  REPORT COMPLETE")
@@ -356,8 +311,11 @@ def generate_report():
         'snapshots_analyzed': len(snapshots),
     }
     
-    with open(OUTPUT_DIR / "correlation_summary.json", 'w') as f:
-        json.dump(summary, f, indent=2)
+    if HAS_ORJSON:
+        (OUTPUT_DIR / "correlation_summary.json").write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(OUTPUT_DIR / "correlation_summary.json", 'w') as f:
+            json.dump(summary, f, indent=2)
 
 
 if __name__ == '__main__':
@@ -8,6 +8,12 @@ import json
 from pathlib import Path
 import numpy as np
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 OBJECTS_DIR = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Objects")
 OUTPUT_PATH = OBJECTS_DIR / "stacks.json"
 
@@ -79,64 +85,103 @@ def load_objects():
     return objects
 
 
-def find_stacks(objects, cluster_range=50):
-    """Find clusters of objects within range."""
+def _cluster(prices, cluster_range):
+    """Assign a stack id to every object; prices must be sorted ascending.
+    
+    Sorted prices split into stacks wherever the gap to the previous object
+    is wider than cluster_range, so every split decision is independent and
+    the ids are just a running count of the splits.
+    """
+    if len(prices) == 0:
+        return np.zeros(0, dtype=np.int32)
+    
+    new_stack = np.diff(prices) > cluster_range
+    return np.concatenate(([0], np.cumsum(new_stack))).astype(np.int32)
+
+
+def _cluster_relative(prices, radii):
+    """Like _cluster, but each object reaches its own radius (e.g. bps of price).
+    
+    Two objects link when either one's [price - radius, price + radius]
+    window holds the other. The windows are found for all objects at once
+    with searchsorted; the sorted objects then split between k and k+1
+    exactly when no window from below reaches past k and none from above
+    reaches down to k.
+    """
+    n = len(prices)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+    
+    los = np.searchsorted(prices, prices - radii, side='left')
+    his = np.searchsorted(prices, prices + radii, side='right')
+    
+    reach_up = np.maximum.accumulate(his)                # first index no lower object reaches
+    reach_down = np.minimum.accumulate(los[::-1])[::-1]  # lowest index any higher object reaches
+    
+    k = np.arange(n - 1)
+    new_stack = (reach_up[:-1] <= k + 1) & (reach_down[1:] >= k + 1)
+    return np.concatenate(([0], np.cumsum(new_stack))).astype(np.int32)
+
+
+def find_stacks(objects, cluster_range=50, cluster_bps=None):
+    """Find clusters of objects within range.
+    
+    cluster_range is in price units; pass cluster_bps instead to make the
+    range scale with price (basis points of each object's price).
+    """
     
     if not objects:
         return []
     
     # Sort by price
-    objects = sorted(objects, key=lambda x: x['price'])
+    prices = np.fromiter((o['price'] for o in objects), dtype=np.float64, count=len(objects))
+    order = np.argsort(prices, kind='stable')
+    prices = prices[order]
+    objects = [objects[i] for i in order]
+    
+    if cluster_bps is None:
+        cluster_ids = _cluster(prices, float(cluster_range))
+    else:
+        cluster_ids = _cluster_relative(prices, np.abs(prices) * (cluster_bps / 10_000))
+    
+    # Stacks are contiguous runs of the sorted objects
+    bounds = np.flatnonzero(np.diff(cluster_ids)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(objects)]))
+    
+    # Only count as stack if 2+ objects
+    is_stack = (ends - starts) >= 2
     
     stacks = []
-    used = set()
     
-    for i, obj in enumerate(objects):
-        if obj['id'] in used:
-            continue
+    for start, end in zip(starts[is_stack].tolist(), ends[is_stack].tolist()):
+        stack_objects = objects[start:end]
+        stack_low = prices[start]
+        stack_high = prices[end - 1]
+        
+        # Calculate stack metrics
+        types_in_stack = list(set(o['type'] for o in stack_objects))
+        avg_score = sum(o['score'] for o in stack_objects) / len(stack_objects)
         
-        # Start a stack
-        stack_objects = [obj]
-        stack_low = obj['price']
-        stack_high = obj['price']
-        used.add(obj['id'])
+        # Density score: more objects = higher density
+        density_score = min(100, len(stack_objects) * 20)
         
-        # Find nearby objects
-        for j, other in enumerate(objects):
-            if other['id'] in used:
-                continue
-            
-            # Check if within range of stack
-            if abs(other['price'] - stack_low) <= cluster_range or abs(other['price'] - stack_high) <= cluster_range:
-                stack_objects.append(other)
-                stack_low = min(stack_low, other['price'])
-                stack_high = max(stack_high, other['price'])
-                used.add(other['id'])
+        # Diversity bonus: multiple types = more confluence
+        diversity_bonus = min(30, len(types_in_stack) * 10)
         
-        if len(stack_objects) >= 2:  # Only count as stack if 2+ objects
-            # Calculate stack metrics
-            types_in_stack = list(set(o['type'] for o in stack_objects))
-            avg_score = sum(o['score'] for o in stack_objects) / len(stack_objects)
-            
-            # Density score: more objects = higher density
-            density_score = min(100, len(stack_objects) * 20)
-            
-            # Diversity bonus: multiple types = more confluence
-            diversity_bonus = min(30, len(types_in_stack) * 10)
-            
-            stacks.append({
-                'id': f"STACK_{int(stack_low)}",
-                'price_low': float(stack_low),
-                'price_high': float(stack_high),
-                'price_mid': float((stack_low + stack_high) / 2),
-                'object_count': len(stack_objects),
-                'types': types_in_stack,
-                'type_count': len(types_in_stack),
-                'avg_score': round(avg_score, 1),
-                'density_score': density_score,
-                'confluence_score': round(avg_score * 0.4 + density_score * 0.4 + diversity_bonus, 1),
-                'objects': [{'type': o['type'], 'price': o['price'], 'id': o['id']} for o in stack_objects]
-            })
+        stacks.append({
+            'id': f"STACK_{int(stack_low)}",
+            'price_low': stack_low,
+            'price_high': stack_high,
+            'price_mid': (stack_low + stack_high) / 2,
+            'object_count': len(stack_objects),
+            'types': types_in_stack,
+            'type_count': len(types_in_stack),
+            'avg_score': round(avg_score, 1),
+            'density_score': density_score,
+            'confluence_score': round(avg_score * 0.4 + density_score * 0.4 + diversity_bonus, 1),
+            'objects': [{'type': o['type'], 'price': o['price'], 'id': o['id']} for o in stack_objects]
+        })
     
     return stacks
 
@@ -159,8 +204,11 @@ def main():
     
     stacks = sorted(stacks, key=lambda x: x['confluence_score'], reverse=True)
     
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump({'stacks': stacks}, f, indent=2)
+    if HAS_ORJSON:
+        OUTPUT_PATH.write_bytes(orjson.dumps({'stacks': stacks}, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(OUTPUT_PATH, 'w') as f:
+            json.dump({'stacks': stacks}, f, indent=2)
     
     print(f"\n{'='*70}")
     print(f"  STACK DETECTOR - CONFLUENCE ZONES")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The analytics bots are standalone scripts; import them from the 06_ANALYTICS root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import pattern_detector
+
+
+@pytest.fixture
+def log_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(pattern_detector, 'CANDLE_PATH', tmp_path / 'missing.parquet')
+    monkeypatch.setattr(pattern_detector, 'PATTERN_LOG_PATH', tmp_path / 'pattern_touches.json')
+    monkeypatch.setattr(pattern_detector, 'PATTERN_JSONL_PATH', tmp_path / 'pattern_touches.jsonl')
+    return tmp_path / 'pattern_touches.json', tmp_path / 'pattern_touches.jsonl'
+
+
+def _touch(bounced):
+    return {'touch_candle': {'type': 'DOJI'}, 'outcome_15m': {'bounced': bounced}}
+
+
+def test_legacy_log_is_migrated_ahead_of_appended_touches(log_paths):
+    legacy_path, jsonl_path = log_paths
+    legacy_path.write_text(json.dumps([_touch(True), _touch(True)]))
+    jsonl_path.write_bytes(pattern_detector._dumps_line(_touch(False)) + b'{not json\n')
+
+    logger = pattern_detector.PatternTouchLogger(skip_load=True)
+
+    assert [t['outcome_15m']['bounced'] for t in logger.iter_touches()] == [True, True, False]
+    assert not legacy_path.exists()
+    assert legacy_path.with_suffix('.json.migrated').exists()
+
+
+def test_non_list_legacy_log_is_left_alone(log_paths, capsys):
+    legacy_path, jsonl_path = log_paths
+    legacy_path.write_text(json.dumps({'touches': []}))
+
+    logger = pattern_detector.PatternTouchLogger(skip_load=True)
+
+    assert 'not migrated' in capsys.readouterr().out
+    assert legacy_path.exists()
+    assert logger.get_pattern_stats() == {}
+
+
+def test_save_refuses_to_overwrite_history_it_never_loaded(log_paths):
+    _, jsonl_path = log_paths
+    jsonl_path.write_bytes(pattern_detector._dumps_line(_touch(True)))
+
+    logger = pattern_detector.PatternTouchLogger(skip_load=True)
+    with pytest.raises(RuntimeError):
+        logger.save()
+
+    assert len(list(logger.iter_touches())) == 1
+
+
+def test_save_rewrites_loaded_history(log_paths):
+    _, jsonl_path = log_paths
+    jsonl_path.write_bytes(pattern_detector._dumps_line(_touch(True)) + b'{not json\n')
+
+    logger = pattern_detector.PatternTouchLogger()
+    logger.save()
+
+    assert jsonl_path.read_bytes() == pattern_detector._dumps_line(_touch(True))
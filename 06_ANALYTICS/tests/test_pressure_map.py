@@ -0,0 +1,33 @@
+from pressure_map import calc_pressure
+
+
+def _objects(*prices):
+    return [{'price': price, 'type': f'OBJ{i}'} for i, price in enumerate(prices)]
+
+
+def test_nearest_below_keeps_original_order_among_equal_prices():
+    objects = _objects(90.0, 95.0, 95.0, 95.0, 95.0, 110.0)
+    
+    below = calc_pressure(objects, 100.0)['below']
+    
+    # Same result as sorted(below, key=price, reverse=True)[:3]
+    assert [o['type'] for o in below['nearest_3']] == ['OBJ1', 'OBJ2', 'OBJ3']
+    assert below['total'] == 5
+
+
+def test_nearest_above_keeps_original_order_among_equal_prices():
+    objects = _objects(120.0, 105.0, 90.0, 105.0, 105.0, 105.0)
+    
+    above = calc_pressure(objects, 100.0)['above']
+    
+    assert [o['type'] for o in above['nearest_3']] == ['OBJ1', 'OBJ3', 'OBJ4']
+    assert above['total'] == 5
+
+
+def test_objects_at_current_price_are_neither_above_nor_below():
+    objects = _objects(100.0, 99.0, 100.0, 101.0)
+    
+    pressure = calc_pressure(objects, 100.0)
+    
+    assert [o['type'] for o in pressure['below']['nearest_3']] == ['OBJ1']
+    assert [o['type'] for o in pressure['above']['nearest_3']] == ['OBJ3']
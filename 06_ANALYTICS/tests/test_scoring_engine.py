@@ -0,0 +1,39 @@
+import numpy as np
+
+from scoring_engine import HardenedWickScorer, SCORE_COMPONENTS, WickEvent, WickFeatures
+
+
+def test_score_wick_matches_batch_scoring():
+    rng = np.random.default_rng(0)
+    features = [
+        WickFeatures(
+            rejection_velocity=float(vel),
+            imbalance_trap_score=float(imb),
+            vwap_mean_reversion_score=float(vwap),
+        )
+        for vel, imb, vwap in zip(rng.uniform(0, 4, 200), rng.uniform(0, 100, 200), rng.uniform(0, 100, 200))
+    ]
+    # Tier boundaries are exclusive
+    features += [WickFeatures(vwap_mean_reversion_score=v, imbalance_trap_score=80.0) for v in (40.0, 70.0)]
+    scorer = HardenedWickScorer()
+
+    records = WickFeatures.to_array(features)
+
+    batch = scorer.score_wicks_batch(records)
+
+    # Score the float32-rounded features the batch saw
+    for rec, row in zip(records, batch.to_dict('records')):
+        single = scorer.score_wick(WickEvent('BTC', 'upper', 1.0, WickFeatures.from_record(rec)))
+        assert single['magnet_score'] == row['magnet_score']
+        assert single['confidence'] == row['confidence']
+        assert set(single['breakdown']) == set(SCORE_COMPONENTS)
+        for name in SCORE_COMPONENTS:
+            assert single['breakdown'][name] == row[name]
+
+
+def test_score_wick_breakdown_is_optional():
+    wick = WickEvent('BTC', 'lower', 1.0, WickFeatures(rejection_velocity=1.0))
+
+    result = HardenedWickScorer().score_wick(wick, include_breakdown=False)
+
+    assert set(result) == {'magnet_score', 'confidence'}
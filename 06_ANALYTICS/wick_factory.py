@@ -4,28 +4,106 @@ Creates wick objects with freshness/quality ranking.
 Lifecycle: UNTOUCHED -> TOUCHED -> SWEPT -> RETIRED
 """
 
+import argparse
 import json
 import time
-from datetime import datetime, timezone
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in decorator so the kernels still run as plain Python."""
+        def wrap(fn):
+            return fn
+        return wrap
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 DATA_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\1m_Candles\BTC_USDT_SWAP_1m.parquet")
 OUTPUT_PATH = Path(r"C:\Users\M.R Bear\Documents\Data_Vault\Objects\wicks.json")
 OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# The only candle columns find_untouched_wicks reads
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+# Freshness age decays to 0 at 24h; --recent-only loads that window plus a 10% margin
+FRESHNESS_WINDOW_MS = int(24 * 60 * 60 * 1000 * 1.1)
+
+
+def _latest_timestamp():
+    """Newest candle timestamp from the parquet row-group stats (no data read)."""
+    meta = pq.ParquetFile(DATA_PATH).metadata
+    col = meta.schema.to_arrow_schema().get_field_index('timestamp')
+    stats = [meta.row_group(i).column(col).statistics for i in range(meta.num_row_groups)]
+    if not stats or any(st is None or not st.has_min_max for st in stats):
+        return int(time.time() * 1000)
+    return max(st.max for st in stats)
+
+
+def load_candles(recent_only=False):
+    """Load the candle columns in timestamp order (the file is normally stored sorted).
+    
+    With recent_only, only the freshness window before the newest candle is
+    read; the timestamp filter lets parquet skip whole row groups by their
+    stats. Wicks older than the window are then not found at all.
+    """
+    if not recent_only:
+        df = pd.read_parquet(DATA_PATH, columns=CANDLE_COLUMNS)
+    else:
+        cutoff = _latest_timestamp() - FRESHNESS_WINDOW_MS
+        table = ds.dataset(DATA_PATH, format='parquet').to_table(
+            columns=CANDLE_COLUMNS, filter=ds.field('timestamp') >= cutoff)
+        df = table.to_pandas()
+    
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp').reset_index(drop=True)
+    return df
+
+
+def load_avg_volume():
+    """Mean volume over the full history (reads just the volume column)."""
+    return float(pd.read_parquet(DATA_PATH, columns=['volume'])['volume'].mean())
+
 
 def load_wicks():
     if OUTPUT_PATH.exists():
+        if HAS_ORJSON:
+            return orjson.loads(OUTPUT_PATH.read_bytes())
         with open(OUTPUT_PATH) as f:
             return json.load(f)
     return {'wicks': [], 'retired': []}
 
 
 def save_wicks(data):
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    if HAS_ORJSON:
+        OUTPUT_PATH.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(OUTPUT_PATH, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+# Score tables: bonus[k] applies when the value has passed k of the edges
+_DIST_EDGES = np.array([0.1, 0.25, 0.5, 1.0])        # dist % (<= edge)
+_DIST_FACTOR = np.array([100, 80, 60, 40, 20])
+_WICK_EDGES = np.array([20, 30, 50, 100])            # wick length (>= edge)
+_WICK_BONUS = np.array([0, 10, 15, 20, 25])
+_RATIO_EDGES = np.array([0.5, 1, 2])                 # wick/body ratio (>= edge)
+_RATIO_BONUS = np.array([0, 10, 15, 25])
+_VOLUME_EDGES = np.array([1, 1.5, 2])                # multiple of avg volume (> edge)
+_VOLUME_BONUS = np.array([0, 10, 15, 20])
 
 
 def calc_freshness_score(ts_created, current_ts, distance_from_price, current_price):
@@ -33,25 +111,18 @@ def calc_freshness_score(ts_created, current_ts, distance_from_price, current_pr
     Freshness score 0-100 based on:
     - Age (newer = fresher)
     - Distance (closer = more relevant)
+    
+    Takes scalars or whole numpy columns.
     """
     # Age factor: decay over 24 hours
     age_minutes = (current_ts - ts_created) / 60000
-    age_factor = max(0, 100 - (age_minutes / 14.4))  # 0 at 24hr
+    age_factor = np.maximum(0, 100 - (age_minutes / 14.4))  # 0 at 24hr
     
     # Distance factor: closer = higher score
-    dist_pct = abs(distance_from_price) / current_price * 100
-    if dist_pct <= 0.1:
-        dist_factor = 100
-    elif dist_pct <= 0.25:
-        dist_factor = 80
-    elif dist_pct <= 0.5:
-        dist_factor = 60
-    elif dist_pct <= 1.0:
-        dist_factor = 40
-    else:
-        dist_factor = 20
+    dist_pct = np.abs(distance_from_price) / current_price * 100
+    dist_factor = _DIST_FACTOR[np.searchsorted(_DIST_EDGES, dist_pct, side='left')]
     
-    return round((age_factor * 0.4 + dist_factor * 0.6), 1)
+    return np.round((age_factor * 0.4 + dist_factor * 0.6), 1)
 
 
 def calc_quality_score(wick_len, body_len, volume, avg_volume):
@@ -60,128 +131,187 @@ def calc_quality_score(wick_len, body_len, volume, avg_volume):
     - Wick length (bigger = more significant)
     - Wick/body ratio (higher = cleaner rejection)
     - Volume (higher = more conviction)
+    
+    Takes scalars or whole numpy columns.
     """
     score = 30  # Base
     
     # Wick length
-    if wick_len >= 100:
-        score += 25
-    elif wick_len >= 50:
-        score += 20
-    elif wick_len >= 30:
-        score += 15
-    elif wick_len >= 20:
-        score += 10
-    
-    # Wick/body ratio
-    if body_len > 0:
-        ratio = wick_len / body_len
-        if ratio >= 2:
-            score += 25
-        elif ratio >= 1:
-            score += 15
-        elif ratio >= 0.5:
-            score += 10
-    else:
-        score += 20  # Doji with wick
+    score = score + _WICK_BONUS[np.searchsorted(_WICK_EDGES, wick_len, side='right')]
+    
+    # Wick/body ratio (doji with wick gets 20)
+    has_body = body_len > 0
+    ratio = wick_len / np.where(has_body, body_len, 1)
+    score = score + np.where(has_body, _RATIO_BONUS[np.searchsorted(_RATIO_EDGES, ratio, side='right')], 20)
     
     # Volume
-    if volume > avg_volume * 2:
-        score += 20
-    elif volume > avg_volume * 1.5:
-        score += 15
-    elif volume > avg_volume:
-        score += 10
-    
-    return min(100, score)
-
-
-def find_untouched_wicks(df, min_wick=20.0):
-    """Find untouched wicks with quality and freshness scoring."""
-    
-    n = len(df)
-    wicks = []
-    
-    highs = df['high'].values
-    lows = df['low'].values
-    opens = df['open'].values
-    closes = df['close'].values
-    volumes = df['volume'].values
-    ts = df['timestamp'].values
-    
-    current_price = closes[-1]
-    current_ts = ts[-1]
-    avg_volume = volumes.mean()
-    
-    # Running max/min from future
-    run_max_h = np.maximum.accumulate(highs[::-1])[::-1]
-    run_min_l = np.minimum.accumulate(lows[::-1])[::-1]
-    
-    for i in range(n - 1):
-        o, h, l, c = opens[i], highs[i], lows[i], closes[i]
-        body_top = max(o, c)
-        body_bot = min(o, c)
-        body = abs(c - o)
-        upper_wick = h - body_top
-        lower_wick = body_bot - l
+    score = score + _VOLUME_BONUS[np.searchsorted(avg_volume * _VOLUME_EDGES, volume, side='left')]
+    
+    return np.minimum(100, score)
+
+
+@njit(cache=True)
+def _rev_cummax(values, out):
+    """out[i] = max(values[i:]), in one backward pass with no reversed copies."""
+    m = -np.inf
+    for i in range(len(values) - 1, -1, -1):
+        if values[i] > m:
+            m = values[i]
+        out[i] = m
+    return out
+
+
+@njit(cache=True)
+def _rev_cummin(values, out):
+    """out[i] = min(values[i:]), in one backward pass with no reversed copies."""
+    m = np.inf
+    for i in range(len(values) - 1, -1, -1):
+        if values[i] < m:
+            m = values[i]
+        out[i] = m
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _scan_wicks(opens, highs, lows, closes, run_max_h, run_min_l, min_wick):
+    """Flag untouched upper/lower wicks for every candle but the last.
+    
+    Fuses the wick geometry and both untouched tests into one pass over
+    the columns; run_max_h/run_min_l are the running max/min from each
+    candle to the end.
+    """
+    n = max(len(highs) - 1, 0)
+    up_mask = np.zeros(n, dtype=np.bool_)
+    lo_mask = np.zeros(n, dtype=np.bool_)
+    
+    for i in prange(n):
+        body_top = max(opens[i], closes[i])
+        body_bot = min(opens[i], closes[i])
         
         # Upper wick: untouched if future max high never reached
-        if upper_wick >= min_wick and run_max_h[i + 1] < h:
-            distance = h - current_price
-            quality = calc_quality_score(upper_wick, body, volumes[i], avg_volume)
-            freshness = calc_freshness_score(ts[i], current_ts, distance, current_price)
-            
-            wicks.append({
-                'id': f"WU_{int(ts[i])}",
-                'type': 'UPPER_WICK',
-                'price': float(h),
-                'wick_len': float(upper_wick),
-                'body_len': float(body),
-                'ts_created': int(ts[i]),
-                'datetime': datetime.fromtimestamp(ts[i]/1000, tz=timezone.utc).isoformat(),
-                'quality_score': quality,
-                'freshness_score': freshness,
-                'combined_score': round((quality * 0.6 + freshness * 0.4), 1),
-                'volume': float(volumes[i]),
-                'state': 'UNTOUCHED',
-                'distance': float(distance),
-            })
-        
+        up_mask[i] = highs[i] - body_top >= min_wick and run_max_h[i + 1] < highs[i]
         # Lower wick: untouched if future min low never reached
-        if lower_wick >= min_wick and run_min_l[i + 1] > l:
-            distance = l - current_price
-            quality = calc_quality_score(lower_wick, body, volumes[i], avg_volume)
-            freshness = calc_freshness_score(ts[i], current_ts, distance, current_price)
-            
-            wicks.append({
-                'id': f"WL_{int(ts[i])}",
-                'type': 'LOWER_WICK',
-                'price': float(l),
-                'wick_len': float(lower_wick),
-                'body_len': float(body),
-                'ts_created': int(ts[i]),
-                'datetime': datetime.fromtimestamp(ts[i]/1000, tz=timezone.utc).isoformat(),
-                'quality_score': quality,
-                'freshness_score': freshness,
-                'combined_score': round((quality * 0.6 + freshness * 0.4), 1),
-                'volume': float(volumes[i]),
-                'state': 'UNTOUCHED',
-                'distance': float(distance),
-            })
-    
-    return wicks
+        lo_mask[i] = body_bot - lows[i] >= min_wick and run_min_l[i + 1] > lows[i]
+    
+    return up_mask, lo_mask
+
+
+def find_untouched_wicks(df, min_wick=20.0, avg_volume=None):
+    """Find untouched wicks with quality and freshness scoring.
+    
+    avg_volume is the baseline the volume bonus compares against; it
+    defaults to the mean over df, so pass the full-history mean when df
+    is only a recent slice.
+    
+    Returns one numpy column per wick field (see wicks_to_records), one
+    entry per wick in candle order.
+    """
+    # Zero-copy views when the columns are already float64/int64
+    highs = df['high'].to_numpy(dtype=np.float64, copy=False)
+    lows = df['low'].to_numpy(dtype=np.float64, copy=False)
+    opens = df['open'].to_numpy(dtype=np.float64, copy=False)
+    closes = df['close'].to_numpy(dtype=np.float64, copy=False)
+    volumes = df['volume'].to_numpy(dtype=np.float64, copy=False)
+    ts = df['timestamp'].to_numpy(dtype=np.int64, copy=False)
+    
+    current_price = float(closes[-1])
+    current_ts = int(ts[-1])
+    if avg_volume is None:
+        avg_volume = float(volumes.mean())
+    
+    # Running max/min from future. This has to be the whole suffix, not a
+    # bounded (e.g. 1440-candle) window: a wick touched at any later point
+    # is no longer untouched. It is a single O(n) pass over whatever
+    # history was loaded.
+    run_max_h = _rev_cummax(highs, np.empty(len(highs)))
+    run_min_l = _rev_cummin(lows, np.empty(len(lows)))
+    
+    up_mask, lo_mask = _scan_wicks(opens, highs, lows, closes, run_max_h, run_min_l, float(min_wick))
+    
+    # One compaction for both sides: interleaving the masks as (upper, lower)
+    # pairs yields hits in candle order with a candle's upper wick first,
+    # and each hit k decodes to candle k // 2, side k % 2
+    hits = np.flatnonzero(np.column_stack((up_mask, lo_mask)).ravel())
+    rows = hits >> 1
+    is_lower = (hits & 1).astype(bool)
+    
+    # Wick geometry for the emitted candles only
+    o, h, l, c = opens[rows], highs[rows], lows[rows], closes[rows]
+    body = np.abs(c - o)
+    
+    # Score every emitted wick in one pass per column
+    prices = np.where(is_lower, l, h)
+    distances = prices - current_price
+    wick_lens = np.where(is_lower, np.minimum(o, c) - l, h - np.maximum(o, c))
+    quality = calc_quality_score(wick_lens, body, volumes[rows], avg_volume)
+    freshness = calc_freshness_score(ts[rows], current_ts, distances, current_price)
+    
+    return {
+        'ts_created': ts[rows],
+        'is_lower': is_lower,
+        'price': prices,
+        'wick_len': wick_lens,
+        'body_len': body,
+        'volume': volumes[rows],
+        'distance': distances,
+        'quality_score': quality,
+        'freshness_score': freshness,
+        'combined_score': np.round(quality * 0.6 + freshness * 0.4, 1),
+    }
+
+
+def wicks_to_records(wicks, order=None):
+    """Turn find_untouched_wicks() columns into wick dicts, optionally in `order`."""
+    if order is not None:
+        wicks = {name: col[order] for name, col in wicks.items()}
+    
+    cols = [wicks[name].tolist() for name in (
+        'ts_created', 'is_lower', 'price', 'wick_len', 'body_len', 'volume',
+        'distance', 'quality_score', 'freshness_score', 'combined_score')]
+    # Candle opens are whole minutes, so this matches datetime.isoformat()
+    datetimes = pd.to_datetime(wicks['ts_created'], unit='ms', utc=True).strftime('%Y-%m-%dT%H:%M:%S+00:00').tolist()
+    
+    return [
+        {
+            'id': f"{'WL' if lower else 'WU'}_{ts_i}",
+            'type': 'LOWER_WICK' if lower else 'UPPER_WICK',
+            'price': price,
+            'wick_len': wick_len,
+            'body_len': body_len,
+            'ts_created': ts_i,
+            'datetime': iso,
+            'quality_score': quality,
+            'freshness_score': fresh,
+            'combined_score': combined,
+            'volume': volume,
+            'state': 'UNTOUCHED',
+            'distance': distance,
+        }
+        for ts_i, lower, price, wick_len, body_len, volume, distance, quality, fresh, combined, iso
+        in zip(*cols, datetimes)
+    ]
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Find and score untouched wicks')
+    parser.add_argument('--recent-only', action='store_true',
+                        help='Scan only the last ~24h freshness window (faster); '
+                             'wicks.json then leaves out older untouched wicks')
+    args = parser.parse_args()
+    
     print("Loading candles...")
-    df = pd.read_parquet(DATA_PATH).sort_values('timestamp').reset_index(drop=True)
+    df = load_candles(recent_only=args.recent_only)
     print(f"Loaded {len(df)} candles")
     
+    # Volume bonus is always judged against the full-history average
+    avg_volume = load_avg_volume() if args.recent_only else None
+    
     print("Finding untouched wicks with scoring...")
-    wicks = find_untouched_wicks(df, min_wick=20.0)
+    found = find_untouched_wicks(df, min_wick=20.0, avg_volume=avg_volume)
     
     # Sort by combined score
-    wicks = sorted(wicks, key=lambda x: x['combined_score'], reverse=True)
+    order = np.argsort(-found['combined_score'], kind='stable')
+    wicks = wicks_to_records(found, order)
     
     data = {'wicks': wicks, 'retired': []}
     save_wicks(data)
@@ -194,16 +324,16 @@ def main():
     print(f"{'='*70}")
     print(f"  Total wicks found: {len(wicks)}")
     
-    upper = [w for w in wicks if w['type'] == 'UPPER_WICK']
-    lower = [w for w in wicks if w['type'] == 'LOWER_WICK']
+    lower_n = int(found['is_lower'].sum())
     
-    print(f"  Upper wicks: {len(upper)}")
-    print(f"  Lower wicks: {len(lower)}")
+    print(f"  Upper wicks: {len(wicks) - lower_n}")
+    print(f"  Lower wicks: {lower_n}")
     
     # Score distribution
-    high_s = len([w for w in wicks if w['combined_score'] >= 70])
-    med_s = len([w for w in wicks if 50 <= w['combined_score'] < 70])
-    low_s = len([w for w in wicks if w['combined_score'] < 50])
+    combined = found['combined_score']
+    high_s = int((combined >= 70).sum())
+    med_s = int(((combined >= 50) & (combined < 70)).sum())
+    low_s = int((combined < 50).sum())
     
     print(f"\n  SCORE DISTRIBUTION:")
     print(f"    High (70+):  {high_s}")
@@ -1,5 +1,5 @@
 # API Clients package
-from .base_client import BaseClient, WebSocketClient, BackoffConfig, ConnectionState
+from .base_client import BaseClient, WebSocketClient, BackoffConfig, ConnectionState, run_event_loop
 from .whale_alert import WhaleAlertClient, WhaleTransaction, TransactionType
 from .alchemy import AlchemyClient, CUTracker, TokenBalance
 from .etherscan import EtherscanClient, ContractInfo, TokenInfo, CacheStats
@@ -11,6 +11,7 @@ __all__ = [
     "WebSocketClient", 
     "BackoffConfig",
     "ConnectionState",
+    "run_event_loop",
     # Whale Alert
     "WhaleAlertClient",
     "WhaleTransaction",
@@ -28,6 +28,7 @@ CU Costs (approximate):
     - eth_getBalance: 15 CU
     - eth_call: 26 CU
     - eth_getTransactionReceipt: 15 CU
+    - eth_getBlockReceipts: 500 CU (whole block)
     - eth_subscribe: 10 CU per notification
 
 Logging:
@@ -51,16 +52,77 @@ import json
 import asyncio
 import aiohttp
 import logging
+import functools
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable, Union
 from datetime import datetime, timezone
 from enum import Enum
 
-from .base_client import WebSocketClient, BackoffConfig, ConnectionState
+from .base_client import WebSocketClient, BackoffConfig, ConnectionState, TTLCache, run_event_loop
+from rate_limiting import AdaptiveTokenBucket
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data):
+    """Parse a JSON body (bytes or str), using orjson when available."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """Serialize WebSocket requests (text frames), using orjson when available."""
+    return orjson.dumps(obj).decode() if HAS_ORJSON else json.dumps(obj)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize HTTP request bodies straight to bytes, using orjson when available."""
+    return orjson.dumps(obj) if HAS_ORJSON else json.dumps(obj).encode()
+
+
+def _memoize_ttl(ttl: float):
+    """
+    Cache an async client method's result per arguments for `ttl` seconds.
+    
+    Concurrent callers with the same arguments share one in-flight request
+    instead of each issuing their own. None (a failed query) is never cached.
+    """
+    def decorator(fn):
+        name = fn.__name__
+        
+        @functools.wraps(fn)
+        async def wrapper(self, *args):
+            key = (name, *args)
+            
+            cached = self._ttl_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn(self, *args))
+                self._inflight[key] = task
+                
+                def _store(task):
+                    self._inflight.pop(key, None)
+                    if not task.cancelled() and task.exception() is None and task.result() is not None:
+                        self._ttl_cache.set(key, task.result(), ttl)
+                
+                task.add_done_callback(_store)
+            
+            # Shielded so one caller being cancelled does not cancel the others
+            return await asyncio.shield(task)
+        
+        return wrapper
+    return decorator
+
+
 # =============================================================================
 # CONSTANTS
 # =============================================================================
@@ -104,12 +166,126 @@ ERC20_DECIMALS = "0x313ce567"   # decimals()
 ERC20_SYMBOL = "0x95d89b41"     # symbol()
 ERC20_NAME = "0x06fdde03"       # name()
 
+# balanceOf selector as raw bytes, for building Multicall3 calldata
+_BALANCE_OF_SELECTOR = bytes.fromhex(ERC20_BALANCE_OF[2:])
+
+# aggregate3((address,bool,bytes)[])
+_AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+
+
+@functools.lru_cache(maxsize=100_000)
+def _pad_addr(addr: str) -> str:
+    """
+    Address as 64 lowercase hex chars (one left-padded ABI word, no 0x).
+    
+    Cached because trackers query the same wallets and tokens repeatedly.
+    """
+    return addr.lower().removeprefix("0x").zfill(64)
+
+
+def _encode_balanceof(addr: str) -> bytes:
+    """
+    Encode balanceOf(address) calldata without an ABI encoder.
+    
+    The call is always the 4-byte selector followed by the address
+    left-padded to one 32-byte word.
+    """
+    return _BALANCE_OF_SELECTOR + bytes.fromhex(_pad_addr(addr))
+
+
+def _encode_aggregate3(calls: List[Tuple[str, bool, bytes]]) -> bytes:
+    """
+    Encode aggregate3 calldata for a list of (target, allowFailure, callData).
+    
+    Layout after the selector: offset to the array (0x20), array length,
+    one offset per call (relative to the first offset word), then each call
+    as target, allowFailure, offset to callData (0x60), callData length and
+    the callData right-padded to a whole number of words.
+    """
+    heads = []
+    tails = []
+    offset = 32 * len(calls)
+    for target, allow_failure, call_data in calls:
+        padded = call_data + bytes(-len(call_data) % 32)
+        tail = b"".join((
+            bytes.fromhex(_pad_addr(target)),
+            int(allow_failure).to_bytes(32, "big"),
+            (0x60).to_bytes(32, "big"),
+            len(call_data).to_bytes(32, "big"),
+            padded,
+        ))
+        heads.append(offset.to_bytes(32, "big"))
+        tails.append(tail)
+        offset += len(tail)
+    
+    return b"".join((
+        _AGGREGATE3_SELECTOR,
+        (0x20).to_bytes(32, "big"),
+        len(calls).to_bytes(32, "big"),
+        *heads,
+        *tails,
+    ))
+
+
+def _decode_aggregate3_result(result: str) -> List[Tuple[bool, bytes]]:
+    """
+    Decode the (bool success, bytes returnData)[] returned by aggregate3.
+    
+    The hex payload is converted to bytes once; every ABI word is then read
+    with int.from_bytes on a slice instead of parsing hex substrings.
+    """
+    raw = bytes.fromhex(result[2:] if result.startswith("0x") else result)
+    
+    def word(offset: int) -> int:
+        return int.from_bytes(raw[offset:offset + 32], "big")
+    
+    array_start = word(0) + 32  # Skip the offset word, then the length word
+    decoded = []
+    for i in range(word(array_start - 32)):
+        item = array_start + word(array_start + 32 * i)
+        success = word(item) != 0
+        data_start = item + word(item + 32)
+        length = word(data_start)
+        decoded.append((success, raw[data_start + 32:data_start + 32 + length]))
+    return decoded
+
+
+# Per-method HTTP timeouts for single RPC calls (seconds); most reads answer
+# well under a second, so a stuck request should fail fast, not hold 30s
+_METHOD_TIMEOUTS = {
+    method: aiohttp.ClientTimeout(total=total)
+    for method, total in {
+        "eth_getBalance": 3,
+        "eth_call": 5,
+        "eth_getBlockByNumber": 8,
+        "eth_getBlockReceipts": 30,
+        "eth_getLogs": 30,
+    }.items()
+}
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Pre-serialized WebSocket requests; only the request id (and for
+# unsubscribe the JSON-encoded subscription id) is filled in per call
+_SUBSCRIBE_NEW_HEADS = '{"jsonrpc":"2.0","id":%d,"method":"eth_subscribe","params":["newHeads"]}'
+_SUBSCRIBE_PENDING_TXS = '{"jsonrpc":"2.0","id":%d,"method":"eth_subscribe","params":["newPendingTransactions"]}'
+_UNSUBSCRIBE = '{"jsonrpc":"2.0","id":%d,"method":"eth_unsubscribe","params":[%s]}'
+
+# Max calls per JSON-RPC batch request (Alchemy rejects batches over 1000)
+BATCH_CHUNK = 500
+
+# Max batch requests in flight at once
+BATCH_CONCURRENCY = 8
+
+# Max memoized query results kept in memory (see _memoize_ttl)
+MEMO_CACHE_MAXSIZE = 10_000
+
 # CU costs per method
 CU_COSTS = {
     "eth_blockNumber": 10,
     "eth_getBalance": 15,
     "eth_call": 26,
     "eth_getTransactionReceipt": 15,
+    "eth_getBlockReceipts": 500,
     "eth_getTransactionByHash": 15,
     "eth_getLogs": 75,
     "eth_getBlockByNumber": 16,
@@ -122,12 +298,23 @@ CU_COSTS = {
 # DATA CLASSES
 # =============================================================================
 
+# Fixed slot per known method, so CUTracker can count into flat arrays
+METHOD_IDX = {method: i for i, method in enumerate(CU_COSTS)}
+
+
+def _zero_counters() -> array:
+    return array("Q", bytes(8 * len(CU_COSTS)))
+
+
 @dataclass
 class CUTracker:
     """Track compute unit usage."""
     total_used: int = 0
     calls_made: int = 0
-    by_method: Dict[str, int] = field(default_factory=dict)
+    # Per-method calls/CU, indexed by METHOD_IDX; methods outside CU_COSTS go to _other_cu
+    _counts: array = field(default_factory=_zero_counters, repr=False)
+    _cu: array = field(default_factory=_zero_counters, repr=False)
+    _other_cu: Dict[str, int] = field(default_factory=dict, repr=False)
     
     def record(self, method: str, cu: int = None):
         """Record CU usage for a method call."""
@@ -136,7 +323,38 @@ class CUTracker:
         
         self.total_used += cu
         self.calls_made += 1
-        self.by_method[method] = self.by_method.get(method, 0) + cu
+        
+        idx = METHOD_IDX.get(method)
+        if idx is None:
+            self._other_cu[method] = self._other_cu.get(method, 0) + cu
+        else:
+            self._counts[idx] += 1
+            self._cu[idx] += cu
+    
+    def record_batch(self, method: str, count: int):
+        """Record `count` calls of one method (e.g. a JSON-RPC batch) at once."""
+        cu = CU_COSTS.get(method, 26) * count
+        
+        self.total_used += cu
+        self.calls_made += count
+        
+        idx = METHOD_IDX.get(method)
+        if idx is None:
+            self._other_cu[method] = self._other_cu.get(method, 0) + cu
+        else:
+            self._counts[idx] += count
+            self._cu[idx] += cu
+    
+    @property
+    def by_method(self) -> Dict[str, int]:
+        """CU used per method (only methods that were called)."""
+        by_method = {
+            method: self._cu[idx]
+            for method, idx in METHOD_IDX.items()
+            if self._counts[idx]
+        }
+        by_method.update(self._other_cu)
+        return by_method
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -196,11 +414,16 @@ class AlchemyClient(WebSocketClient):
             config=config,
             ws_url=ws_url,
             ping_interval=30.0,
+            # WebSocket reconnects: retry fast at first, but keep trying for
+            # ~5 min on average (~10 min worst case) before giving up
             backoff=BackoffConfig(
-                initial_delay=1.0,
+                initial_delay=0.1,
                 max_delay=60.0,
-                max_attempts=10,
+                max_attempts=18,
+                full_jitter=True,
             ),
+            raw_messages=True,  # orjson parses the frame bytes directly
+            compression=None,   # newHeads/pending tx frames are small and frequent
         )
         
         self.api_key = api_key
@@ -213,12 +436,41 @@ class AlchemyClient(WebSocketClient):
         # CU tracking
         self._cu_tracker = CUTracker()
         
+        # CU-weighted pacing: Alchemy meters compute units per second, so
+        # requests wait on CU cost and the rate adapts to 429 responses
+        cu_per_sec = getattr(getattr(config, "alchemy", None), "cu_per_sec", 330)
+        self._atb = AdaptiveTokenBucket(
+            "alchemy",
+            init_rate=cu_per_sec,
+            capacity=cu_per_sec,
+            alpha=0.5,
+            beta=0.7,
+            sigma=cu_per_sec * 0.01,
+            delta=cu_per_sec * 0.1,
+            max_rate=cu_per_sec,
+        )
+        
         # Request ID counter
         self._request_id = 0
         
+        # Bounds concurrent JSON-RPC batch posts
+        self._batch_sema = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        # Memoized query results (bounded LRU, each method sets its own ttl)
+        # and shared in-flight requests (see _memoize_ttl)
+        self._ttl_cache = TTLCache(MEMO_CACHE_MAXSIZE, float("inf"))
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        
         # Subscription handlers
-        self._subscription_handlers: Dict[str, List] = {}
+        # Handlers are stored as (is_coroutine, handler), classified once at
+        # registration; _sub_dispatch maps a live sub_id straight to its list
+        self._subscription_handlers: Dict[str, List[Tuple[bool, Callable]]] = {}
         self._subscriptions: Dict[str, str] = {}  # sub_id -> sub_type
+        self._sub_dispatch: Dict[str, List[Tuple[bool, Callable]]] = {}
+        
+        # WebSocket request id -> future awaiting its response (see _ws_request)
+        self._pending_requests: Dict[int, asyncio.Future] = {}
+        self._pending_subscribes: Dict[int, str] = {}  # request id -> sub_type
         
         logger.info(f"AlchemyClient initialized for chain {chain_id}")
     
@@ -237,17 +489,39 @@ class AlchemyClient(WebSocketClient):
         self._request_id += 1
         return self._request_id
     
+    def _next_ids(self, count: int) -> range:
+        """Reserve a contiguous block of request IDs for a batch."""
+        start = self._request_id + 1
+        self._request_id += count
+        return range(start, self._request_id + 1)
+    
     async def _connect(self) -> None:
         """Establish connections."""
-        # Create HTTP session
-        if self._http_session is None or self._http_session.closed:
-            self._http_session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={"Content-Type": "application/json"},
-            )
+        # HTTP and WebSocket setup are independent, so their handshakes overlap
+        await asyncio.gather(self._create_http_session(), super()._connect())
+    
+    async def _create_http_session(self) -> None:
+        """Create the HTTP session if needed and warm its first connection."""
+        if self._http_session is not None and not self._http_session.closed:
+            return
+        
+        # One long-lived pool: every RPC reuses a warm keep-alive connection
+        # instead of paying DNS + TLS setup again.
+        self._http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=64,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30, connect=5, sock_read=25),
+            headers={"Content-Type": "application/json"},
+        )
         
-        # Connect WebSocket (parent class)
-        await super()._connect()
+        # eth_chainId costs 0 CU; it opens the TLS connection the first real
+        # query would otherwise have to wait for
+        await self._rpc_call("eth_chainId", track_cu=False)
     
     async def _disconnect(self) -> None:
         """Close connections."""
@@ -256,6 +530,12 @@ class AlchemyClient(WebSocketClient):
             await self._http_session.close()
             self._http_session = None
         
+        # Nothing will answer requests still waiting on the old socket
+        for future in self._pending_requests.values():
+            future.cancel()
+        self._pending_requests.clear()
+        self._pending_subscribes.clear()
+        
         # Close WebSocket (parent class)
         await super()._disconnect()
     
@@ -276,10 +556,15 @@ class AlchemyClient(WebSocketClient):
         Returns:
             Result or None on failure
         """
-        if not self._acquire_rate_limit():
-            logger.warning("Alchemy rate limit exhausted")
+        cu_cost = CU_COSTS.get(method, 26)
+        
+        # Monthly CU budget is fail-closed; the adaptive bucket only paces
+        if track_cu and not self._charge_budget(cu_cost):
+            logger.critical(f"Alchemy CU budget exhausted, refusing {method}")
             return None
         
+        await self._atb.acquire(cu_cost)
+        
         payload = {
             "jsonrpc": "2.0",
             "id": self._next_id(),
@@ -288,25 +573,34 @@ class AlchemyClient(WebSocketClient):
         }
         
         try:
-            async with self._http_session.post(self.http_url, json=payload) as resp:
+            async with self._http_session.post(
+                self.http_url,
+                data=_json_bytes(payload),
+                timeout=_METHOD_TIMEOUTS.get(method, _DEFAULT_TIMEOUT),
+            ) as resp:
                 self._record_activity()
                 
                 if resp.status == 429:
                     retry_after = int(resp.headers.get("Retry-After", 1))
                     logger.warning(f"Alchemy rate limited, retry after {retry_after}s")
-                    await asyncio.sleep(retry_after)
+                    self._atb.decrease_rate(retry_after)
                     return None
                 
                 if resp.status != 200:
                     logger.error(f"Alchemy HTTP error: {resp.status}")
                     return None
                 
-                data = await resp.json()
+                data = _json_loads(await resp.read())
                 
                 if "error" in data:
+                    # Alchemy can also report CU throttling as a JSON-RPC error
+                    if data["error"].get("code") == 429:
+                        self._atb.decrease_rate()
                     logger.error(f"Alchemy RPC error: {data['error']}")
                     return None
                 
+                self._atb.increase_rate()
+                
                 # Track CU
                 if track_cu:
                     self._cu_tracker.record(method)
@@ -320,10 +614,24 @@ class AlchemyClient(WebSocketClient):
             self._record_error(f"RPC call failed: {e}")
             return None
     
-    async def _handle_message(self, message: str) -> None:
+    async def _handle_message(self, message: Union[str, bytes]) -> None:
         """Handle WebSocket message."""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
+            
+            # Response to a request sent with _ws_request
+            future = self._pending_requests.pop(data.get("id"), None)
+            if future is not None:
+                # Bind a new subscription here, before the receive loop can
+                # hand us its first notification
+                sub_type = self._pending_subscribes.pop(data["id"], None)
+                if sub_type is not None and "result" in data:
+                    self._subscriptions[data["result"]] = sub_type
+                    self._sub_dispatch[data["result"]] = self._subscription_handlers[sub_type]
+                
+                if not future.done():
+                    future.set_result(data)
+                return
             
             # Check for subscription notification
             if data.get("method") == "eth_subscription":
@@ -331,13 +639,11 @@ class AlchemyClient(WebSocketClient):
                 sub_id = params.get("subscription")
                 result = params.get("result")
                 
-                if sub_id and sub_id in self._subscriptions:
-                    sub_type = self._subscriptions[sub_id]
-                    handlers = self._subscription_handlers.get(sub_type, [])
-                    
-                    for handler in handlers:
+                handlers = self._sub_dispatch.get(sub_id)
+                if handlers is not None:
+                    for is_coro, handler in handlers:
                         try:
-                            if asyncio.iscoroutinefunction(handler):
+                            if is_coro:
                                 await handler(result)
                             else:
                                 handler(result)
@@ -354,6 +660,7 @@ class AlchemyClient(WebSocketClient):
     # BASIC QUERIES
     # =========================================================================
     
+    @_memoize_ttl(0.5)
     async def get_block_number(self) -> Optional[int]:
         """Get current block number."""
         result = await self._rpc_call("eth_blockNumber")
@@ -361,6 +668,7 @@ class AlchemyClient(WebSocketClient):
             return int(result, 16)
         return None
     
+    @_memoize_ttl(float("inf"))
     async def get_chain_id(self) -> Optional[int]:
         """Get chain ID."""
         result = await self._rpc_call("eth_chainId", track_cu=False)
@@ -396,6 +704,21 @@ class AlchemyClient(WebSocketClient):
         """
         return await self._rpc_call("eth_getTransactionReceipt", [tx_hash])
     
+    async def get_block_receipts(self, block: str = "latest") -> Optional[List[Dict]]:
+        """
+        Get every transaction receipt in a block with one call.
+        
+        Much cheaper than one eth_getTransactionReceipt per transaction once
+        a block has more than ~30 transactions.
+        
+        Args:
+            block: Block number (hex), block hash or "latest"
+            
+        Returns:
+            List of receipt dicts or None
+        """
+        return await self._rpc_call("eth_getBlockReceipts", [block])
+    
     async def get_transaction(self, tx_hash: str) -> Optional[Dict]:
         """
         Get transaction by hash.
@@ -444,8 +767,7 @@ class AlchemyClient(WebSocketClient):
         """
         # Encode balanceOf(address) call
         # Function selector + padded address
-        wallet_padded = wallet.lower().replace("0x", "").zfill(64)
-        call_data = f"{ERC20_BALANCE_OF}{wallet_padded}"
+        call_data = f"{ERC20_BALANCE_OF}{_pad_addr(wallet)}"
         
         result = await self._rpc_call("eth_call", [
             {"to": token_contract, "data": call_data},
@@ -458,6 +780,14 @@ class AlchemyClient(WebSocketClient):
     
     async def get_token_decimals(self, token_contract: str) -> Optional[int]:
         """Get token decimals."""
+        decimals = await self._get_token_decimals(token_contract)
+        if decimals is not None:
+            return decimals
+        return 18  # Default
+    
+    @_memoize_ttl(86400)
+    async def _get_token_decimals(self, token_contract: str) -> Optional[int]:
+        """Read decimals(); None if the call failed, so the default is never cached."""
         result = await self._rpc_call("eth_call", [
             {"to": token_contract, "data": ERC20_DECIMALS},
             "latest"
@@ -465,8 +795,9 @@ class AlchemyClient(WebSocketClient):
         
         if result and result != "0x":
             return int(result, 16)
-        return 18  # Default
+        return None
     
+    @_memoize_ttl(86400)
     async def get_token_symbol(self, token_contract: str) -> Optional[str]:
         """Get token symbol."""
         result = await self._rpc_call("eth_call", [
@@ -477,19 +808,33 @@ class AlchemyClient(WebSocketClient):
         if result and len(result) > 2:
             try:
                 # Decode string from ABI encoding
-                hex_data = result[2:]  # Remove 0x
-                if len(hex_data) >= 128:
+                raw = bytes.fromhex(result[2:])  # Remove 0x
+                if len(raw) >= 64:
                     # Standard ABI encoding
-                    length = int(hex_data[64:128], 16)
-                    symbol_hex = hex_data[128:128 + length * 2]
-                    return bytes.fromhex(symbol_hex).decode('utf-8').strip('\x00')
+                    length = int.from_bytes(raw[32:64], "big")
+                    return raw[64:64 + length].decode('utf-8').strip('\x00')
                 else:
                     # Bytes32 encoding (some tokens)
-                    return bytes.fromhex(hex_data).decode('utf-8').strip('\x00')
+                    return raw.decode('utf-8').strip('\x00')
             except Exception:
                 pass
         return None
     
+    async def get_token_metadata(self, token_contract: str) -> Dict[str, Any]:
+        """
+        Get token symbol and decimals.
+        
+        The two eth_calls are independent, so they run concurrently.
+        
+        Returns:
+            Dict with "symbol" (None if unreadable) and "decimals"
+        """
+        symbol, decimals = await asyncio.gather(
+            self.get_token_symbol(token_contract),
+            self.get_token_decimals(token_contract),
+        )
+        return {"symbol": symbol, "decimals": decimals}
+    
     # =========================================================================
     # MULTICALL BATCHING
     # =========================================================================
@@ -530,48 +875,17 @@ class AlchemyClient(WebSocketClient):
         """
         Batch ETH balance queries using JSON-RPC batching.
         
-        One HTTP request, multiple RPC calls.
+        One HTTP request per BATCH_CHUNK addresses. Addresses in a batch
+        that failed are left out of the result.
         """
-        if not self._acquire_rate_limit():
-            return {}
+        results = await self._batch_rpc("eth_getBalance", [[addr, block] for addr in addresses])
         
-        # Build batch request
-        batch = []
-        for i, addr in enumerate(addresses):
-            batch.append({
-                "jsonrpc": "2.0",
-                "id": self._next_id(),
-                "method": "eth_getBalance",
-                "params": [addr, block],
-            })
+        # Parse results
+        balances = {}
+        for i, result in results.items():
+            balances[addresses[i]] = int(result, 16) if result else 0
         
-        try:
-            async with self._http_session.post(self.http_url, json=batch) as resp:
-                self._record_activity()
-                
-                if resp.status != 200:
-                    logger.error(f"Alchemy batch error: {resp.status}")
-                    return {}
-                
-                results = await resp.json()
-                
-                # Track CU (one call per address, but single HTTP request)
-                for _ in addresses:
-                    self._cu_tracker.record("eth_getBalance")
-                
-                # Parse results
-                balances = {}
-                for i, result in enumerate(results):
-                    if "result" in result and result["result"]:
-                        balances[addresses[i]] = int(result["result"], 16)
-                    else:
-                        balances[addresses[i]] = 0
-                
-                return balances
-                
-        except Exception as e:
-            self._record_error(f"Batch balance query failed: {e}")
-            return {}
+        return balances
     
     async def get_token_balances_batch(
         self,
@@ -582,7 +896,8 @@ class AlchemyClient(WebSocketClient):
         """
         Get multiple token balances for ONE wallet using Multicall3.
         
-        This is the efficient way - one RPC call for many tokens.
+        This is the efficient way - one eth_call for many tokens. Falls back
+        to JSON-RPC batching if the Multicall3 call itself fails.
         
         Args:
             wallet: Wallet address
@@ -595,21 +910,25 @@ class AlchemyClient(WebSocketClient):
         if not token_contracts:
             return {}
         
-        # Build Multicall3 calls
-        wallet_padded = wallet.lower().replace("0x", "").zfill(64)
+        # Build Multicall3 (target, allowFailure, callData) calls.
+        # The calldata only depends on the wallet, so it is encoded once.
+        call_data = _encode_balanceof(wallet)
+        calls = [(token, True, call_data) for token in token_contracts]
+        
+        result = await self._rpc_call("eth_call", [
+            {"to": MULTICALL3_ADDRESS, "data": "0x" + _encode_aggregate3(calls).hex()},
+            block
+        ])
         
-        calls = []
-        for token in token_contracts:
-            call_data = f"{ERC20_BALANCE_OF}{wallet_padded}"
-            calls.append({
-                "target": token,
-                "allowFailure": True,
-                "callData": bytes.fromhex(call_data[2:]) if call_data.startswith("0x") else bytes.fromhex(call_data),
-            })
+        if not result or result == "0x":
+            logger.warning("Multicall3 aggregate3 failed, falling back to batch RPC")
+            return await self._batch_get_token_balances(wallet, token_contracts, block)
         
-        # Encode aggregate3 call
-        # This is complex ABI encoding, so we'll use a simpler approach: batch RPC
-        return await self._batch_get_token_balances(wallet, token_contracts, block)
+        # Failed or empty sub-calls (e.g. non-ERC20 targets) read as 0
+        balances = {}
+        for token, (success, data) in zip(token_contracts, _decode_aggregate3_result(result)):
+            balances[token] = int.from_bytes(data[:32], "big") if success and data else 0
+        return balances
     
     async def _batch_get_token_balances(
         self,
@@ -620,56 +939,173 @@ class AlchemyClient(WebSocketClient):
         """
         Batch token balance queries using JSON-RPC batching.
         """
-        if not self._acquire_rate_limit():
-            return {}
+        # balanceOf calldata only depends on the wallet, so every call shares it
+        call_data = f"{ERC20_BALANCE_OF}{_pad_addr(wallet)}"
         
-        wallet_padded = wallet.lower().replace("0x", "").zfill(64)
+        results = await self._batch_rpc(
+            "eth_call",
+            [[{"to": token, "data": call_data}, block] for token in token_contracts],
+        )
         
-        # Build batch request
-        batch = []
-        for token in token_contracts:
-            call_data = f"{ERC20_BALANCE_OF}{wallet_padded}"
-            batch.append({
-                "jsonrpc": "2.0",
-                "id": self._next_id(),
-                "method": "eth_call",
-                "params": [{"to": token, "data": call_data}, block],
-            })
+        # Parse results
+        balances = {}
+        for i, result in results.items():
+            if result and result != "0x":
+                try:
+                    balances[token_contracts[i]] = int(result, 16)
+                except ValueError:
+                    balances[token_contracts[i]] = 0
+            else:
+                balances[token_contracts[i]] = 0
         
-        try:
-            async with self._http_session.post(self.http_url, json=batch) as resp:
-                self._record_activity()
-                
-                if resp.status != 200:
-                    return {}
-                
-                results = await resp.json()
-                
-                # Track CU
-                for _ in token_contracts:
-                    self._cu_tracker.record("eth_call")
-                
-                # Parse results
-                balances = {}
-                for i, result in enumerate(results):
-                    if "result" in result and result["result"] and result["result"] != "0x":
-                        try:
-                            balances[token_contracts[i]] = int(result["result"], 16)
-                        except ValueError:
-                            balances[token_contracts[i]] = 0
-                    else:
-                        balances[token_contracts[i]] = 0
-                
-                return balances
-                
-        except Exception as e:
-            self._record_error(f"Batch token balance query failed: {e}")
-            return {}
+        return balances
+    
+    async def _batch_rpc(self, method: str, params_list: List[List]) -> Dict[int, Any]:
+        """
+        Run many calls of one method as JSON-RPC batches.
+        
+        Calls are split into BATCH_CHUNK-sized batches that are posted
+        concurrently (bounded by _batch_sema), which keeps request bodies
+        under Alchemy's batch cap and spreads the CU load.
+        
+        Returns:
+            Dict of call index -> result for every call whose batch succeeded
+        """
+        starts = range(0, len(params_list), BATCH_CHUNK)
+        chunks = await asyncio.gather(*(
+            self._post_batch(method, params_list[start:start + BATCH_CHUNK])
+            for start in starts
+        ))
+        
+        results = {}
+        for start, chunk in zip(starts, chunks):
+            if chunk is not None:
+                for offset, result in enumerate(chunk):
+                    results[start + offset] = result
+        return results
+    
+    async def _post_batch(self, method: str, params_list: List[List]) -> Optional[List[Any]]:
+        """
+        POST one JSON-RPC batch.
+        
+        Returns:
+            Results in request order (None for calls without a result),
+            or None if the whole batch failed
+        """
+        cu_cost = CU_COSTS.get(method, 26) * len(params_list)
+        
+        if not self._charge_budget(cu_cost):
+            logger.critical(f"Alchemy CU budget exhausted, refusing {method} batch")
+            return None
+        
+        async with self._batch_sema:
+            await self._atb.acquire(cu_cost)
+            
+            request_ids = self._next_ids(len(params_list))
+            batch = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params,
+                }
+                for request_id, params in zip(request_ids, params_list)
+            ]
+            
+            try:
+                async with self._http_session.post(self.http_url, data=_json_bytes(batch)) as resp:
+                    self._record_activity()
+                    
+                    if resp.status == 429:
+                        self._atb.decrease_rate(int(resp.headers.get("Retry-After", 1)))
+                        return None
+                    
+                    if resp.status != 200:
+                        logger.error(f"Alchemy batch error: {resp.status}")
+                        return None
+                    
+                    responses = _json_loads(await resp.read())
+                    self._atb.increase_rate()
+                    
+                    # Track CU (one call per entry, but single HTTP request)
+                    self._cu_tracker.record_batch(method, len(params_list))
+                    
+                    # Batch responses are not guaranteed to keep request order
+                    by_id = {response.get("id"): response.get("result") for response in responses}
+                    return [by_id.get(request_id) for request_id in request_ids]
+                    
+            except Exception as e:
+                self._record_error(f"Batch {method} query failed: {e}")
+                return None
+
+    async def snapshot(
+        self,
+        addresses: List[str],
+        tokens_by_wallet: Optional[Dict[str, List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get block number, ETH balances and token balances in one round.
+        
+        None of the queries depend on each other, so they are all in flight
+        at once and the snapshot costs one round trip instead of one each.
+        
+        Args:
+            addresses: Wallets to query ETH balances for
+            tokens_by_wallet: Dict of wallet -> token contracts to query
+            
+        Returns:
+            Dict with "block", "balances" (address -> wei) and
+            "token_balances" (wallet -> token_contract -> raw balance)
+        """
+        tokens_by_wallet = tokens_by_wallet or {}
+        
+        block, balances, *token_results = await asyncio.gather(
+            self.get_block_number(),
+            self.get_balances_batch(addresses),
+            *(
+                self.get_token_balances_batch(wallet, tokens)
+                for wallet, tokens in tokens_by_wallet.items()
+            ),
+        )
+        
+        return {
+            "block": block,
+            "balances": balances,
+            "token_balances": dict(zip(tokens_by_wallet, token_results)),
+        }
 
     # =========================================================================
     # WEBSOCKET SUBSCRIPTIONS
     # =========================================================================
     
+    async def _ws_request(
+        self,
+        request_id: int,
+        message: str,
+        timeout: float = 10,
+        sub_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a JSON-RPC request over the WebSocket and wait for its response.
+        
+        The receive loop is the only reader of the socket; _handle_message
+        hands the response with the matching id to the future parked here,
+        so notifications arriving first cannot be mistaken for the reply.
+        For eth_subscribe pass sub_type, and the returned subscription is
+        bound as soon as the reply is read.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = future
+        if sub_type is not None:
+            self._pending_subscribes[request_id] = sub_type
+        
+        try:
+            await self._ws.send(message)
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending_requests.pop(request_id, None)
+            self._pending_subscribes.pop(request_id, None)
+    
     async def subscribe_new_heads(self, handler) -> Optional[str]:
         """
         Subscribe to new block headers.
@@ -685,28 +1121,20 @@ class AlchemyClient(WebSocketClient):
             return None
         
         # Register handler
-        if "newHeads" not in self._subscription_handlers:
-            self._subscription_handlers["newHeads"] = []
-        self._subscription_handlers["newHeads"].append(handler)
+        self._subscription_handlers.setdefault("newHeads", []).append(
+            (asyncio.iscoroutinefunction(handler), handler)
+        )
         
         # Send subscription request
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": "eth_subscribe",
-            "params": ["newHeads"],
-        }
+        request_id = self._next_id()
         
         try:
-            await self._ws.send(json.dumps(request))
-            
-            # Wait for response
-            response = await asyncio.wait_for(self._ws.recv(), timeout=10)
-            data = json.loads(response)
+            data = await self._ws_request(
+                request_id, _SUBSCRIBE_NEW_HEADS % request_id, sub_type="newHeads"
+            )
             
             if "result" in data:
                 sub_id = data["result"]
-                self._subscriptions[sub_id] = "newHeads"
                 logger.info(f"Subscribed to newHeads: {sub_id}")
                 return sub_id
             else:
@@ -730,25 +1158,19 @@ class AlchemyClient(WebSocketClient):
         if self._state != ConnectionState.CONNECTED or not self._ws:
             return None
         
-        if "newPendingTransactions" not in self._subscription_handlers:
-            self._subscription_handlers["newPendingTransactions"] = []
-        self._subscription_handlers["newPendingTransactions"].append(handler)
+        self._subscription_handlers.setdefault("newPendingTransactions", []).append(
+            (asyncio.iscoroutinefunction(handler), handler)
+        )
         
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": "eth_subscribe",
-            "params": ["newPendingTransactions"],
-        }
+        request_id = self._next_id()
         
         try:
-            await self._ws.send(json.dumps(request))
-            response = await asyncio.wait_for(self._ws.recv(), timeout=10)
-            data = json.loads(response)
+            data = await self._ws_request(
+                request_id, _SUBSCRIBE_PENDING_TXS % request_id, sub_type="newPendingTransactions"
+            )
             
             if "result" in data:
                 sub_id = data["result"]
-                self._subscriptions[sub_id] = "newPendingTransactions"
                 logger.info(f"Subscribed to pending txs: {sub_id}")
                 return sub_id
             return None
@@ -770,20 +1192,14 @@ class AlchemyClient(WebSocketClient):
         if not self._ws or sub_id not in self._subscriptions:
             return False
         
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._next_id(),
-            "method": "eth_unsubscribe",
-            "params": [sub_id],
-        }
+        request_id = self._next_id()
         
         try:
-            await self._ws.send(json.dumps(request))
-            response = await asyncio.wait_for(self._ws.recv(), timeout=10)
-            data = json.loads(response)
+            data = await self._ws_request(request_id, _UNSUBSCRIBE % (request_id, _json_dumps(sub_id)))
             
             if data.get("result"):
                 sub_type = self._subscriptions.pop(sub_id, None)
+                self._sub_dispatch.pop(sub_id, None)
                 logger.info(f"Unsubscribed from {sub_type}: {sub_id}")
                 return True
             return False
@@ -805,6 +1221,7 @@ class AlchemyClient(WebSocketClient):
         base_metrics = super().get_metrics()
         base_metrics.update({
             "cu_usage": self._cu_tracker.to_dict(),
+            "rate_limit": self._atb.get_metrics(),
             "chain_id": self.chain_id,
             "active_subscriptions": len(self._subscriptions),
         })
@@ -914,4 +1331,4 @@ if __name__ == "__main__":
         await client.disconnect()
         print("\n✅ Test complete!")
     
-    asyncio.run(test_client())
+    run_event_loop(test_client())
@@ -35,16 +35,42 @@ Usage:
 import asyncio
 import time
 import random
+import inspect
 import logging
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, Callable
-from datetime import datetime, timezone
+from functools import partial, cached_property
+from typing import Optional, Dict, Any, Callable, Hashable, Union
+from datetime import datetime, timezone, timedelta
 from enum import Enum
 
+try:
+    from rate_limiting import get_budget_tracker
+except ImportError:
+    get_budget_tracker = None
+
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 logger = logging.getLogger(__name__)
 
 
+def run_event_loop(main):
+    """
+    Run a coroutine to completion on uvloop when installed, else asyncio.
+
+    uvloop is optional (it does not support Windows); entrypoints should use
+    this instead of asyncio.run so every client gets the faster loop for free.
+    """
+    if HAS_UVLOOP:
+        return uvloop.run(main)
+    return asyncio.run(main)
+
+
 # =============================================================================
 # CONNECTION STATE
 # =============================================================================
@@ -70,11 +96,26 @@ class BackoffConfig:
     multiplier: float = 2.0
     jitter: float = 0.25  # ±25%
     max_attempts: int = 10
+    full_jitter: bool = False  # Pick uniformly in [0, delay] instead of ±jitter
+    
+    @cached_property
+    def base_delays(self) -> tuple:
+        """Un-jittered delay for each attempt, computed once."""
+        return tuple(
+            min(self.initial_delay * (self.multiplier ** attempt), self.max_delay)
+            for attempt in range(self.max_attempts)
+        )
     
     def get_delay(self, attempt: int) -> float:
         """Calculate delay for given attempt number."""
-        delay = self.initial_delay * (self.multiplier ** attempt)
-        delay = min(delay, self.max_delay)
+        if attempt < self.max_attempts:
+            delay = self.base_delays[attempt]
+        else:
+            delay = min(self.initial_delay * (self.multiplier ** attempt), self.max_delay)
+        
+        if self.full_jitter:
+            # Spreads simultaneous retries across the whole window
+            return random.uniform(0, delay)
         
         # Add jitter
         jitter_range = delay * self.jitter
@@ -83,6 +124,52 @@ class BackoffConfig:
         return max(0.1, delay)  # Minimum 100ms
 
 
+# =============================================================================
+# MEMORY CACHE
+# =============================================================================
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry.
+    
+    Holds at most `maxsize` entries, evicting the least recently used, so
+    a long run over many unique keys keeps a flat memory footprint.
+    Entries older than `ttl` seconds (or the ttl given to set()) read as
+    missing.
+    """
+    
+    __slots__ = ("maxsize", "ttl", "_data")
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        if item[0] <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return item[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value, expiring after ttl seconds (default: the cache's ttl)."""
+        data = self._data
+        data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 # =============================================================================
 # BASE CLIENT
 # =============================================================================
@@ -121,18 +208,36 @@ class BaseClient(ABC):
         self._last_error: Optional[str] = None
         self._last_error_time: Optional[datetime] = None
         
+        # Set by disconnect() so a reconnect loop stops waiting out its backoff
+        self._closing = asyncio.Event()
+        
         # Metrics
         self._connect_count = 0
         self._reconnect_count = 0
         self._error_count = 0
-        self._last_activity: Optional[datetime] = None
+        # Activity is stamped with monotonic time (cheap, once per message);
+        # the wall-clock datetime is only derived for health/metrics output
+        self._start_wall = datetime.now(timezone.utc)
+        self._start_mono = time.monotonic()
+        self._last_activity_mono: Optional[float] = None
         self._messages_received = 0
         self._messages_processed = 0
         
-        # Rate limiter (lazy loaded)
+        # Rate limiter (lazy loaded; the tracker's checks for this API are
+        # bound on first use, see _bind_rate_limiter)
         self._budget_tracker = None
-        
-        logger.info(f"BaseClient initialized for {api_name}")
+        self._tracker_can_call: Optional[Callable[[], bool]] = None
+        self._tracker_acquire: Optional[Callable[[], bool]] = None
+        self._tracker_charge: Optional[Callable[[float], bool]] = None
+        
+        # Local mirror of the per-second bucket, so requests that would be
+        # throttled anyway are turned away without touching the tracker
+        self._bucket_capacity = float("inf")
+        self._bucket_rate = 0.0
+        self._bucket_tokens = float("inf")
+        self._bucket_last = time.monotonic()
+        
+        logger.info("BaseClient initialized for %s", api_name)
     
     @property
     def state(self) -> ConnectionState:
@@ -147,27 +252,83 @@ class BaseClient(ABC):
     def _get_budget_tracker(self):
         """Lazy load budget tracker."""
         if self._budget_tracker is None:
-            from rate_limiting import get_budget_tracker
+            if get_budget_tracker is None:
+                raise ImportError("rate_limiting package not available")
             self._budget_tracker = get_budget_tracker()
         return self._budget_tracker
     
-    def _can_make_request(self) -> bool:
-        """Check if rate limit allows a request."""
+    def _bind_rate_limiter(self) -> None:
+        """
+        Resolve the budget tracker once and bind its checks for this API.
+        
+        Binding waits for first use so a tracker set up later by
+        init_budget_tracker is still picked up. The local bucket starts
+        from the tracker's per-second bucket for this API.
+        """
         try:
             tracker = self._get_budget_tracker()
-            return tracker.can_call(self.api_name)
+            self._tracker_can_call = partial(tracker.can_call, self.api_name)
+            self._tracker_acquire = partial(tracker.acquire, self.api_name)
+            self._tracker_charge = partial(tracker.charge_budget, self.api_name)
+            limits = tracker.get_status(self.api_name).get("rate_limit")
         except Exception as e:
-            logger.warning(f"Rate limit check failed: {e}")
-            return True  # Fail open for rate limit check
+            logger.warning("Rate limiter unavailable, failing open: %s", e)
+            self._tracker_can_call = self._tracker_acquire = lambda: True
+            self._tracker_charge = lambda units: True
+            limits = None
+        
+        if limits:
+            self._bucket_capacity = limits["capacity"]
+            self._bucket_rate = limits["refill_rate"]
+            self._bucket_tokens = limits["tokens_available"]
+            self._bucket_last = time.monotonic()
+    
+    def _local_tokens(self) -> float:
+        """Refill the local bucket and return its token count."""
+        now = time.monotonic()
+        self._bucket_tokens = min(
+            self._bucket_capacity,
+            self._bucket_tokens + (now - self._bucket_last) * self._bucket_rate,
+        )
+        self._bucket_last = now
+        return self._bucket_tokens
+    
+    def _can_make_request(self) -> bool:
+        """Check if rate limit allows a request."""
+        if self._tracker_can_call is None:
+            self._bind_rate_limiter()
+        
+        if self._local_tokens() < 1:
+            return False
+        return self._tracker_can_call()
     
     def _acquire_rate_limit(self) -> bool:
-        """Acquire rate limit token."""
-        try:
-            tracker = self._get_budget_tracker()
-            return tracker.acquire(self.api_name)
-        except Exception as e:
-            logger.warning(f"Rate limit acquire failed: {e}")
-            return True  # Fail open
+        """
+        Acquire rate limit token.
+        
+        The local bucket only short-circuits denials; every request it lets
+        through still goes to the tracker, which owns the daily/monthly
+        budgets.
+        """
+        if self._tracker_acquire is None:
+            self._bind_rate_limiter()
+        
+        if self._local_tokens() < 1:
+            return False
+        self._bucket_tokens -= 1
+        return self._tracker_acquire()
+    
+    def _charge_budget(self, units: float) -> bool:
+        """
+        Charge units against the tracker's daily/monthly budgets only.
+        
+        For clients that pace requests themselves (see AlchemyClient) but
+        whose budget is counted in other units than requests.
+        """
+        if self._tracker_charge is None:
+            self._bind_rate_limiter()
+        
+        return self._tracker_charge(units)
     
     def _record_error(self, error: str) -> None:
         """Record an error occurrence."""
@@ -175,7 +336,7 @@ class BaseClient(ABC):
         self._last_error = error
         self._last_error_time = datetime.now(timezone.utc)
         
-        logger.error(f"{self.api_name} error: {error}", extra={
+        logger.error("%s error: %s", self.api_name, error, extra={
             "api": self.api_name,
             "error": error,
             "error_count": self._error_count,
@@ -183,7 +344,14 @@ class BaseClient(ABC):
     
     def _record_activity(self) -> None:
         """Record activity timestamp."""
-        self._last_activity = datetime.now(timezone.utc)
+        self._last_activity_mono = time.monotonic()
+    
+    @property
+    def _last_activity(self) -> Optional[datetime]:
+        """Wall-clock time of the last recorded activity."""
+        if self._last_activity_mono is None:
+            return None
+        return self._start_wall + timedelta(seconds=self._last_activity_mono - self._start_mono)
     
     async def _reconnect_loop(self) -> bool:
         """
@@ -197,16 +365,25 @@ class BaseClient(ABC):
         for attempt in range(self.backoff.max_attempts):
             delay = self.backoff.get_delay(attempt)
             
-            logger.info(f"{self.api_name} reconnecting in {delay:.1f}s (attempt {attempt + 1}/{self.backoff.max_attempts})")
+            logger.info(
+                "%s reconnecting in %.1fs (attempt %d/%d)",
+                self.api_name, delay, attempt + 1, self.backoff.max_attempts,
+            )
             
-            await asyncio.sleep(delay)
+            # Sleep out the backoff, but give up at once if disconnect() is called
+            try:
+                await asyncio.wait_for(self._closing.wait(), timeout=delay)
+                logger.info("%s reconnect abandoned, client closing", self.api_name)
+                return False
+            except asyncio.TimeoutError:
+                pass
             
             try:
                 await self._connect()
                 self._state = ConnectionState.CONNECTED
                 self._reconnect_count += 1
                 
-                logger.info(f"{self.api_name} reconnected successfully", extra={
+                logger.info("%s reconnected successfully", self.api_name, extra={
                     "api": self.api_name,
                     "attempt": attempt + 1,
                     "reconnect_count": self._reconnect_count,
@@ -219,7 +396,7 @@ class BaseClient(ABC):
                 continue
         
         self._state = ConnectionState.FAILED
-        logger.error(f"{self.api_name} failed to reconnect after {self.backoff.max_attempts} attempts")
+        logger.error("%s failed to reconnect after %d attempts", self.api_name, self.backoff.max_attempts)
         return False
     
     @abstractmethod
@@ -249,6 +426,7 @@ class BaseClient(ABC):
         if self._state == ConnectionState.CONNECTED:
             return True
         
+        self._closing.clear()
         self._state = ConnectionState.CONNECTING
         
         try:
@@ -256,7 +434,7 @@ class BaseClient(ABC):
             self._state = ConnectionState.CONNECTED
             self._connect_count += 1
             
-            logger.info(f"{self.api_name} connected", extra={
+            logger.info("%s connected", self.api_name, extra={
                 "api": self.api_name,
                 "connect_count": self._connect_count,
             })
@@ -270,16 +448,18 @@ class BaseClient(ABC):
     
     async def disconnect(self) -> None:
         """Disconnect from the API."""
+        self._closing.set()
+        
         if self._state == ConnectionState.DISCONNECTED:
             return
         
         try:
             await self._disconnect()
         except Exception as e:
-            logger.warning(f"{self.api_name} disconnect error: {e}")
+            logger.warning("%s disconnect error: %s", self.api_name, e)
         finally:
             self._state = ConnectionState.DISCONNECTED
-            logger.info(f"{self.api_name} disconnected")
+            logger.info("%s disconnected", self.api_name)
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -292,8 +472,8 @@ class BaseClient(ABC):
         
         # Check for stale connection
         is_stale = False
-        if self._last_activity:
-            staleness = (now - self._last_activity).total_seconds()
+        if self._last_activity_mono is not None:
+            staleness = time.monotonic() - self._last_activity_mono
             is_stale = staleness > 300  # 5 minutes
         
         return {
@@ -338,6 +518,7 @@ class WebSocketClient(BaseClient):
     Adds:
     - WebSocket connection handling
     - Ping/pong keepalive
+    - Watchdog for silently stale connections
     - Message queue
     """
     
@@ -349,6 +530,8 @@ class WebSocketClient(BaseClient):
         ping_interval: float = 30.0,
         ping_timeout: float = 10.0,
         backoff: Optional[BackoffConfig] = None,
+        raw_messages: bool = False,
+        compression: Optional[str] = "deflate",
     ):
         """
         Initialize WebSocket client.
@@ -360,24 +543,46 @@ class WebSocketClient(BaseClient):
             ping_interval: Seconds between pings
             ping_timeout: Seconds to wait for pong
             backoff: Backoff configuration
+            raw_messages: Pass text frames to _handle_message as undecoded
+                bytes (for bytes-native parsers; needs websockets >= 13)
+            compression: permessage-deflate ("deflate") or None to skip
+                inflating every frame on high-rate streams
         """
         super().__init__(api_name, config, backoff)
         
         self.ws_url = ws_url
         self.ping_interval = ping_interval
         self.ping_timeout = ping_timeout
+        self.raw_messages = raw_messages
+        self.compression = compression
         
         # WebSocket state
         self._ws = None
         self._receive_task: Optional[asyncio.Task] = None
         self._ping_task: Optional[asyncio.Task] = None
-        
-        # Message handlers
-        self._message_handlers: list[Callable] = []
+        self._watchdog_task: Optional[asyncio.Task] = None
+        
+        # Last WebSocket frame only; _last_activity_mono is also stamped by
+        # HTTP calls on the same client, so it cannot tell a silent socket
+        self._last_frame_mono: Optional[float] = None
+        
+        # One long-lived task runs every reconnect; the receive loop just
+        # signals it (see _supervise)
+        self._reconnect_needed = asyncio.Event()
+        self._supervisor_task: Optional[asyncio.Task] = None
+        
+        # Message handlers, split by kind when added so dispatch never
+        # has to inspect them per message. Tuples, rebuilt on add: handlers
+        # are added rarely and iterated on every message
+        self._sync_handlers: tuple[Callable, ...] = ()
+        self._async_handlers: tuple[Callable, ...] = ()
     
     def add_message_handler(self, handler: Callable) -> None:
-        """Add a message handler callback."""
-        self._message_handlers.append(handler)
+        """Add a message handler callback (plain function or coroutine function)."""
+        if asyncio.iscoroutinefunction(handler):
+            self._async_handlers = (*self._async_handlers, handler)
+        else:
+            self._sync_handlers = (*self._sync_handlers, handler)
     
     async def _connect(self) -> None:
         """Establish WebSocket connection."""
@@ -387,14 +592,34 @@ class WebSocketClient(BaseClient):
             self.ws_url,
             ping_interval=self.ping_interval,
             ping_timeout=self.ping_timeout,
+            compression=self.compression,
         )
         
         # Start receive loop
         self._receive_task = asyncio.create_task(self._receive_loop())
+        
+        # Start watchdog (replacing the one watching the previous socket)
+        if self._watchdog_task:
+            self._watchdog_task.cancel()
+        if self.ping_interval:
+            self._watchdog_task = asyncio.create_task(self._watchdog_loop(self._ws))
+        
+        # Start reconnect supervisor (already running if this is a reconnect)
+        if self._supervisor_task is None:
+            self._reconnect_needed.clear()
+            self._supervisor_task = asyncio.create_task(self._supervise())
     
     async def _disconnect(self) -> None:
         """Close WebSocket connection."""
-        # Cancel tasks
+        # Cancel tasks (supervisor first, so it cannot reconnect behind us)
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            try:
+                await self._supervisor_task
+            except asyncio.CancelledError:
+                pass
+            self._supervisor_task = None
+        
         if self._receive_task:
             self._receive_task.cancel()
             try:
@@ -411,6 +636,14 @@ class WebSocketClient(BaseClient):
                 pass
             self._ping_task = None
         
+        if self._watchdog_task:
+            self._watchdog_task.cancel()
+            try:
+                await self._watchdog_task
+            except asyncio.CancelledError:
+                pass
+            self._watchdog_task = None
+        
         # Close WebSocket
         if self._ws:
             await self._ws.close()
@@ -420,44 +653,126 @@ class WebSocketClient(BaseClient):
         """Main receive loop for WebSocket messages."""
         import websockets
         
+        # Older websockets connections have no recv(decode=...), so they
+        # always deliver str
+        if self.raw_messages and "decode" in inspect.signature(self._ws.recv).parameters:
+            messages = self._iter_raw_messages()
+        else:
+            messages = self._ws
+        
+        # Bound once; the loop body runs for every frame
+        monotonic = time.monotonic
+        handle_message = self._handle_message
+        
         try:
-            async for message in self._ws:
+            async for message in messages:
                 self._messages_received += 1
-                self._record_activity()
+                self._last_frame_mono = self._last_activity_mono = monotonic()
                 
                 try:
-                    await self._handle_message(message)
+                    await handle_message(message)
                     self._messages_processed += 1
                 except Exception as e:
                     self._record_error(f"Message handling error: {e}")
                     
         except websockets.ConnectionClosed as e:
-            logger.warning(f"{self.api_name} WebSocket closed: {e}")
+            logger.warning("%s WebSocket closed: %s", self.api_name, e)
             self._state = ConnectionState.DISCONNECTED
             
             # Trigger reconnect
-            asyncio.create_task(self._reconnect_loop())
+            self._reconnect_needed.set()
             
         except Exception as e:
             self._record_error(f"Receive loop error: {e}")
             self._state = ConnectionState.FAILED
     
-    async def _handle_message(self, message: str) -> None:
+    async def _supervise(self) -> None:
+        """
+        Run _reconnect_loop each time the receive loop reports a drop.
+        
+        Owned by the client and cancelled in _disconnect, so a reconnect in
+        progress never outlives the client as an untracked task.
+        """
+        # Stop on disconnect() even if the cancel lands while _reconnect_loop
+        # is returning (asyncio.wait_for can swallow it then)
+        while not self._closing.is_set():
+            await self._reconnect_needed.wait()
+            self._reconnect_needed.clear()
+            await self._reconnect_loop()
+    
+    async def _watchdog_loop(self, ws) -> None:
+        """
+        Drop a connection that has gone silent and stopped answering pings.
+        
+        NATs and proxies can leave a socket open that no longer delivers
+        anything, without any close event. When no frame has arrived for
+        2x ping_interval, probe with a ping; if no pong comes back within
+        ping_timeout, abort the transport so _receive_loop sees the socket
+        close and starts the normal reconnect.
+        """
+        interval = self.ping_interval
+        timeout = self.ping_timeout or interval
+        opened = time.monotonic()
+        
+        while self._ws is ws:
+            await asyncio.sleep(interval)
+            
+            last_seen = max(self._last_frame_mono or opened, opened)
+            if time.monotonic() - last_seen < 2 * interval:
+                continue
+            
+            try:
+                pong = await ws.ping()
+                await asyncio.wait_for(pong, timeout)
+                # Quiet but alive - nothing to do
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if self._ws is not ws:
+                    return
+                logger.warning(
+                    "%s WebSocket silent for %.0fs and not answering pings, reconnecting",
+                    self.api_name, time.monotonic() - last_seen,
+                )
+                ws.transport.abort()
+                return
+    
+    async def _iter_raw_messages(self):
+        """Yield frames without decoding text to str; ends on a clean close."""
+        import websockets
+        
+        while True:
+            try:
+                yield await self._ws.recv(decode=False)
+            except websockets.ConnectionClosedOK:
+                return
+    
+    async def _handle_message(self, message: Union[str, bytes]) -> None:
         """
         Handle incoming message. Override in subclass for custom handling.
         
         Args:
-            message: Raw message string
+            message: Raw message (bytes if raw_messages is set)
         """
         # Call registered handlers
-        for handler in self._message_handlers:
+        sync_handlers = self._sync_handlers
+        async_handlers = self._async_handlers
+        
+        for handler in sync_handlers:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(message)
-                else:
-                    handler(message)
+                handler(message)
             except Exception as e:
-                logger.error(f"Message handler error: {e}")
+                logger.error("Message handler error: %s", e)
+        
+        # Async handlers run concurrently; one failing does not stop the rest
+        if async_handlers:
+            results = await asyncio.gather(
+                *(handler(message) for handler in async_handlers),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Message handler error: %s", result)
     
     async def send(self, message: str) -> bool:
         """
@@ -470,7 +785,7 @@ class WebSocketClient(BaseClient):
             True if sent successfully
         """
         if not self._ws or self._state != ConnectionState.CONNECTED:
-            logger.warning(f"{self.api_name} cannot send - not connected")
+            logger.warning("%s cannot send - not connected", self.api_name)
             return False
         
         try:
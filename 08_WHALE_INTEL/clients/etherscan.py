@@ -25,7 +25,7 @@ Failure Modes:
 
 Caching Strategy:
     1. In-memory dict (fastest)
-    2. Disk cache (persistent across restarts)
+    2. Disk cache (SQLite, persistent across restarts)
     3. API fetch (last resort)
     Target: 99% cache hit rate
 
@@ -47,24 +47,46 @@ Usage:
 import json
 import asyncio
 import aiohttp
-import hashlib
 import logging
+import sqlite3
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 
-from .base_client import BaseClient, BackoffConfig
+from .base_client import BaseClient, BackoffConfig, TTLCache, run_event_loop
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data):
+    """Parse JSON (bytes or str), using orjson when available."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize straight to bytes, using orjson when available."""
+    return orjson.dumps(obj) if HAS_ORJSON else json.dumps(obj).encode()
+
+
 # =============================================================================
 # CONSTANTS
 # =============================================================================
 
 ETHERSCAN_API_URL = "https://api.etherscan.io/v2/api"
 
+# In-memory cache bounds: entries per cache, and seconds before an entry is
+# refetched (ABIs practically never change; token/contract info can)
+CACHE_MAXSIZE = 50_000
+ABI_CACHE_TTL = 86_400
+INFO_CACHE_TTL = 3_600
+
 # Common token ABIs (pre-cached to avoid API calls)
 ERC20_ABI = [
     {
@@ -120,7 +142,7 @@ ERC20_ABI = [
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractInfo:
     """Contract metadata."""
 
@@ -136,7 +158,7 @@ class ContractInfo:
     compiler_version: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenInfo:
     """Token metadata."""
 
@@ -147,7 +169,7 @@ class TokenInfo:
     total_supply: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheStats:
     """Cache statistics."""
 
@@ -209,13 +231,22 @@ class EtherscanClient(BaseClient):
         self.api_key = api_key
         self.cache_dir = cache_dir
 
+        # Disk cache: one SQLite table keyed by lowercase address, opened in
+        # _connect. Older versions kept one JSON file per ABI in abis/
+        self._disk_path: Optional[Path] = cache_dir / "abis.sqlite3" if cache_dir else None
+        self._legacy_abi_dir: Optional[Path] = cache_dir / "abis" if cache_dir else None
+        self._disk: Optional[sqlite3.Connection] = None
+
         # HTTP session
         self._session: Optional[aiohttp.ClientSession] = None
 
-        # In-memory cache
-        self._abi_cache: Dict[str, List] = {}
-        self._token_cache: Dict[str, TokenInfo] = {}
-        self._contract_cache: Dict[str, ContractInfo] = {}
+        # In-memory cache (bounded, see TTLCache)
+        self._abi_cache = TTLCache(CACHE_MAXSIZE, ABI_CACHE_TTL)
+        self._token_cache = TTLCache(CACHE_MAXSIZE, INFO_CACHE_TTL)
+        self._contract_cache = TTLCache(CACHE_MAXSIZE, INFO_CACHE_TTL)
+
+        # In-flight fetches, so concurrent misses on one address share a call
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
         # Cache stats
         self._cache_stats = CacheStats()
@@ -241,55 +272,102 @@ class EtherscanClient(BaseClient):
         )
 
     async def _connect(self) -> None:
-        """Create HTTP session."""
+        """Create HTTP session and open the disk cache."""
         if self._session is None or self._session.closed:
+            # One long-lived pool for every API call: at 5 RPS a handful of
+            # keep-alive connections covers it, and cache misses skip the
+            # DNS + TLS setup a fresh connection would cost
             self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=30, connect=5),
             )
 
-        # Load disk cache into memory
-        await self._load_disk_cache()
+        # Open disk cache
+        self._open_disk_cache()
 
     async def _disconnect(self) -> None:
-        """Close HTTP session."""
+        """Close HTTP session and disk cache."""
         if self._session and not self._session.closed:
             await self._session.close()
             self._session = None
 
-    async def _load_disk_cache(self) -> None:
-        """Load cached ABIs from disk into memory."""
-        if not self.cache_dir:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _open_disk_cache(self) -> None:
+        """Open the SQLite ABI cache, importing legacy per-file ABIs once."""
+        if not self._disk_path or self._disk is not None:
             return
 
         try:
-            abi_dir = self.cache_dir / "abis"
-            if abi_dir.exists():
-                count = 0
-                for abi_file in abi_dir.glob("*.json"):
-                    try:
-                        address = abi_file.stem.lower()
-                        with open(abi_file, "r") as f:
-                            self._abi_cache[address] = json.load(f)
-                        count += 1
-                    except Exception:
-                        pass
-
-                logger.info(f"Loaded {count} ABIs from disk cache")
+            is_new = not self._disk_path.exists()
+
+            self._disk = sqlite3.connect(self._disk_path)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute("PRAGMA synchronous=NORMAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS abis (address TEXT PRIMARY KEY, abi BLOB NOT NULL)"
+            )
+            self._disk.commit()
+
+            if is_new:
+                self._import_legacy_abis()
         except Exception as e:
-            logger.warning(f"Failed to load disk cache: {e}")
+            logger.warning(f"Failed to open disk cache: {e}")
+            self._disk = None
 
-    def _save_abi_to_disk(self, address: str, abi: List) -> None:
-        """Save ABI to disk cache."""
-        if not self.cache_dir:
+    def _import_legacy_abis(self) -> None:
+        """Copy ABIs from the old one-JSON-file-per-contract cache."""
+        if not self._legacy_abi_dir or not self._legacy_abi_dir.exists():
             return
 
+        rows = []
+        for abi_file in self._legacy_abi_dir.glob("*.json"):
+            try:
+                abi_json = abi_file.read_bytes()
+                _json_loads(abi_json)  # skip corrupt files
+                rows.append((abi_file.stem.lower(), abi_json))
+            except Exception:
+                pass
+
+        self._disk.executemany(
+            "INSERT OR IGNORE INTO abis (address, abi) VALUES (?, ?)", rows
+        )
+        self._disk.commit()
+        logger.info(f"Imported {len(rows)} ABIs from legacy disk cache")
+
+    def _load_abi_from_disk(self, address: str) -> Optional[List]:
+        """Look up an ABI in the disk cache (address must already be lowercase)."""
+        if self._disk is None:
+            return None
+
         try:
-            abi_dir = self.cache_dir / "abis"
-            abi_dir.mkdir(parents=True, exist_ok=True)
+            row = self._disk.execute(
+                "SELECT abi FROM abis WHERE address = ?", (address,)
+            ).fetchone()
+            return _json_loads(row[0]) if row else None
+        except Exception as e:
+            # Corrupt or unreadable entry: fall back to the API
+            logger.warning(f"Failed to read ABI from disk: {e}")
+            return None
 
-            abi_file = abi_dir / f"{address.lower()}.json"
-            with open(abi_file, "w") as f:
-                json.dump(abi, f)
+    def _save_abi_to_disk(self, address: str, abi: List) -> None:
+        """Save ABI to disk cache (address must already be lowercase)."""
+        if self._disk is None:
+            return
+
+        try:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO abis (address, abi) VALUES (?, ?)",
+                (address, _json_bytes(abi)),
+            )
+            self._disk.commit()
         except Exception as e:
             logger.warning(f"Failed to save ABI to disk: {e}")
 
@@ -335,7 +413,8 @@ class EtherscanClient(BaseClient):
                     logger.error(f"Etherscan HTTP error: {resp.status}")
                     return None
 
-                data = await resp.json()
+                # Raw bytes straight to the parser, skipping aiohttp's str decode
+                data = _json_loads(await resp.read())
 
                 # Check for API error
                 if data.get("status") == "0":
@@ -352,7 +431,7 @@ class EtherscanClient(BaseClient):
                         await asyncio.sleep(1)
                         return None
 
-                    logger.debug(f"Etherscan API error: {message} - {result}")
+                    logger.debug("Etherscan API error: %s - %s", message, result)
                     return None
 
                 return data.get("result")
@@ -364,6 +443,22 @@ class EtherscanClient(BaseClient):
             self._record_error(f"API call failed: {e}")
             return None
 
+    async def _coalesce(self, key: tuple, fetch, *args):
+        """
+        Run fetch(*args) once per key, however many callers ask concurrently.
+
+        Later callers await the task already in flight instead of spending
+        another request from the 5 RPS budget.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
     # =========================================================================
     # ABI METHODS
     # =========================================================================
@@ -386,24 +481,29 @@ class EtherscanClient(BaseClient):
         address = address.lower()
 
         # Check memory cache
-        if address in self._abi_cache:
+        abi = self._abi_cache.get(address)
+        if abi is not None:
             self._cache_stats.memory_hits += 1
-            return self._abi_cache[address]
+            return abi
 
-        # Check disk cache (already loaded to memory in _connect)
-        # This branch handles case where we check after disk load
-        if address in self._abi_cache:
+        # Check disk cache
+        abi = self._load_abi_from_disk(address)
+        if abi is not None:
             self._cache_stats.disk_hits += 1
-            return self._abi_cache[address]
+            self._abi_cache[address] = abi
+            return abi
+
+        return await self._coalesce(("abi", address), self._fetch_abi, address)
 
-        # Fetch from API
+    async def _fetch_abi(self, address: str) -> Optional[List]:
+        """Fetch an ABI from the API and cache it (memory + disk)."""
         self._cache_stats.api_fetches += 1
 
         result = await self._api_call("contract", "getabi", {"address": address})
 
         if result and isinstance(result, str):
             try:
-                abi = json.loads(result)
+                abi = _json_loads(result)
 
                 # Cache in memory
                 self._abi_cache[address] = abi
@@ -411,15 +511,18 @@ class EtherscanClient(BaseClient):
                 # Cache to disk
                 self._save_abi_to_disk(address, abi)
 
-                logger.info(
-                    f"Fetched ABI for {address[:10]}...",
-                    extra={
-                        "address": address,
-                        "functions": len(
-                            [x for x in abi if x.get("type") == "function"]
-                        ),
-                    },
-                )
+                # Counting functions walks the whole ABI; skip it when INFO is off
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Fetched ABI for %s...",
+                        address[:10],
+                        extra={
+                            "address": address,
+                            "functions": sum(
+                                1 for x in abi if x.get("type") == "function"
+                            ),
+                        },
+                    )
 
                 return abi
             except json.JSONDecodeError:
@@ -461,8 +564,9 @@ class EtherscanClient(BaseClient):
         address = address.lower()
 
         # Check cache
-        if address in self._contract_cache:
-            return self._contract_cache[address]
+        info = self._contract_cache.get(address)
+        if info is not None:
+            return info
 
         # Get source code (includes verification info)
         result = await self._api_call("contract", "getsourcecode", {"address": address})
@@ -488,7 +592,7 @@ class EtherscanClient(BaseClient):
             abi_str = data.get("ABI")
             if abi_str and abi_str != "Contract source code not verified":
                 try:
-                    info.abi = json.loads(abi_str)
+                    info.abi = _json_loads(abi_str)
                     # Also cache the ABI
                     self._abi_cache[address] = info.abi
                     self._save_abi_to_disk(address, info.abi)
@@ -535,10 +639,16 @@ class EtherscanClient(BaseClient):
         address = address.lower()
 
         # Check cache
-        if address in self._token_cache:
-            return self._token_cache[address]
+        info = self._token_cache.get(address)
+        if info is not None:
+            return info
+
+        return await self._coalesce(
+            ("token", address), self._fetch_token_info, address
+        )
 
-        # Fetch token info
+    async def _fetch_token_info(self, address: str) -> Optional[TokenInfo]:
+        """Fetch token info from the API and cache it."""
         result = await self._api_call(
             "token", "tokeninfo", {"contractaddress": address}
         )
@@ -812,4 +922,4 @@ if __name__ == "__main__":
 
         print("\n✅ Test complete!")
 
-    asyncio.run(test_client())
+    run_event_loop(test_client())
@@ -53,7 +53,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
-from .base_client import BaseClient, BackoffConfig
+from .base_client import BaseClient, BackoffConfig, run_event_loop
 
 logger = logging.getLogger(__name__)
 
@@ -729,4 +729,4 @@ if __name__ == "__main__":
         await client.disconnect()
         print("\n✅ Test complete!")
     
-    asyncio.run(test_client())
+    run_event_loop(test_client())
@@ -50,7 +50,7 @@ from typing import Optional, Dict, Any, List, Callable, Set
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
-from .base_client import BaseClient, BackoffConfig, ConnectionState
+from .base_client import BaseClient, BackoffConfig, ConnectionState, run_event_loop
 
 logger = logging.getLogger(__name__)
 
@@ -697,4 +697,4 @@ if __name__ == "__main__":
         await client.disconnect()
         print("\n✅ Test complete!")
     
-    asyncio.run(test_client())
+    run_event_loop(test_client())
@@ -1,9 +1,10 @@
 # Rate limiting package
-from .token_bucket import TokenBucket, BudgetPeriod, BucketStatus, RateLimitExhausted, BudgetExhausted
+from .token_bucket import TokenBucket, AdaptiveTokenBucket, BudgetPeriod, BucketStatus, RateLimitExhausted, BudgetExhausted
 from .budget_tracker import BudgetTracker, get_budget_tracker, init_budget_tracker, APILimits
 
 __all__ = [
     "TokenBucket",
+    "AdaptiveTokenBucket",
     "BudgetPeriod",
     "BucketStatus",
     "RateLimitExhausted",
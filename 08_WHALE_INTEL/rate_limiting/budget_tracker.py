@@ -317,6 +317,46 @@ class BudgetTracker:
             
             return True
     
+    def charge_budget(self, api: str, units: float) -> bool:
+        """
+        Charge units (e.g. CU) against the API's daily/monthly budgets only.
+        
+        Used by clients that pace their own request rate but still have to
+        respect the periodic budget, which is kept in those units.
+        
+        Args:
+            api: API name
+            units: Budget units this call costs
+            
+        Returns:
+            True if charged, False if a budget is exhausted (fail-closed)
+        """
+        with self._lock:
+            if api not in self._buckets:
+                logger.error(f"Unknown API: {api}", extra={"api": api})
+                return False
+            
+            if api in self._monthly_buckets:
+                if not self._monthly_buckets[api].charge_budget(units):
+                    logger.warning(f"API '{api}' monthly budget exhausted", extra={
+                        "api": api,
+                        "type": "monthly_exhausted",
+                    })
+                    return False
+            
+            if api in self._daily_buckets:
+                if not self._daily_buckets[api].charge_budget(units):
+                    logger.warning(f"API '{api}' daily budget exhausted", extra={
+                        "api": api,
+                        "type": "daily_exhausted",
+                    })
+                    # Refund monthly if we already charged
+                    if api in self._monthly_buckets:
+                        self._monthly_buckets[api]._budget_used -= units
+                    return False
+            
+            return True
+    
     def wait(self, api: str, timeout: float = 30.0) -> bool:
         """
         Wait for API token to become available.
@@ -35,6 +35,7 @@ Usage:
 """
 
 import time
+import asyncio
 import threading
 import logging
 from dataclasses import dataclass, field
@@ -279,6 +280,32 @@ class TokenBucket:
             self._total_waited += 1
             time.sleep(wait_time)
     
+    def charge_budget(self, units: float) -> bool:
+        """
+        Count `units` against the periodic budget without touching tokens.
+        
+        For budgets kept in a different unit than requests (e.g. Alchemy
+        CU), where the per-second rate is enforced elsewhere.
+        
+        Returns:
+            True if charged, False if the budget is already exhausted
+        """
+        with self._lock:
+            self._check_budget_reset()
+            
+            if self._is_budget_exhausted():
+                self._total_denied += 1
+                logger.warning(f"TokenBucket '{self.name}' budget exhausted", extra={
+                    "bucket": self.name,
+                    "budget_used": self._budget_used,
+                    "budget_limit": self.budget_limit,
+                })
+                return False
+            
+            self._budget_used += units
+            self._total_acquired += 1
+            return True
+    
     def wait(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
         """
         Wait for tokens to become available.
@@ -329,6 +356,175 @@ class TokenBucket:
         }
 
 
+# =============================================================================
+# ADAPTIVE TOKEN BUCKET
+# =============================================================================
+
+class AdaptiveTokenBucket:
+    """
+    Asyncio token bucket whose refill rate adapts to upstream throttling.
+    
+    Meant for providers that meter weighted units (e.g. Alchemy compute
+    units per second) and answer 429 when over the limit. Callers await
+    acquire(cost) before each request, so load is paced client-side instead
+    of discovering the limit by getting rejected.
+    
+    Rate control (AIMD with a remembered target):
+    - increase_rate() after a success: while below the target (the last rate
+      known to succeed), close `alpha` of the gap; at or above it, probe
+      upward by `sigma` units/sec, but only if a caller actually had to wait
+      for tokens since the last probe. The rate never exceeds `max_rate`.
+    - decrease_rate() after a 429: the last successful rate becomes the new
+      target, the rate is multiplied by `beta` (never below `delta`), and
+      acquisition can be held for the server's Retry-After.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        init_rate: float,
+        capacity: float,
+        alpha: float = 0.5,
+        beta: float = 0.7,
+        sigma: float = 1.0,
+        delta: float = 1.0,
+        max_rate: Optional[float] = None,
+    ):
+        """
+        Initialize adaptive bucket.
+        
+        Args:
+            name: Identifier for this bucket (for logging)
+            init_rate: Starting refill rate (units per second)
+            capacity: Maximum burst (units)
+            alpha: Fraction of the gap to the target recovered per success
+            beta: Multiplicative decrease applied on throttle (0 < beta < 1)
+            sigma: Additive probe step above the target (units per second)
+            delta: Minimum refill rate (units per second)
+            max_rate: Ceiling for the refill rate, e.g. the plan's limit
+                (units per second, defaults to init_rate)
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        if init_rate <= 0:
+            raise ValueError(f"Refill rate must be positive, got {init_rate}")
+        if not 0 < beta < 1:
+            raise ValueError(f"Beta must be in (0, 1), got {beta}")
+        if max_rate is None:
+            max_rate = init_rate
+        if max_rate < init_rate:
+            raise ValueError(f"max_rate must be at least init_rate, got {max_rate} < {init_rate}")
+        
+        self.name = name
+        self.capacity = float(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.sigma = sigma
+        self.delta = delta
+        self.max_rate = float(max_rate)
+        
+        # State
+        self.rate = float(init_rate)
+        self.target = float(init_rate)
+        self._last_success_rate = float(init_rate)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._hold_until = 0.0
+        
+        # Set when a caller had to wait for tokens, i.e. the rate is what
+        # limits throughput; only then is probing above the target useful
+        self._held_back = False
+        
+        # Waiters are served one at a time, in arrival order
+        self._lock = asyncio.Lock()
+        
+        # Metrics
+        self._total_acquired = 0
+        self._total_waited = 0
+        self._total_throttled = 0
+    
+    def _refill(self) -> None:
+        """Refill tokens based on elapsed time."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+    
+    async def acquire(self, cost: float = 1.0) -> None:
+        """
+        Wait until `cost` units are available, then consume them.
+        
+        Costs above capacity are allowed; they simply wait for a full
+        bucket and drive the balance negative, which delays later callers.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._hold_until:
+                    self._total_waited += 1
+                    await asyncio.sleep(self._hold_until - now)
+                    continue
+                
+                self._refill()
+                needed = min(cost, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= cost
+                    self._total_acquired += 1
+                    return
+                
+                self._total_waited += 1
+                self._held_back = True
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+    
+    def increase_rate(self) -> None:
+        """Record a successful request and raise the rate."""
+        self._last_success_rate = self.rate
+        
+        if self.rate < self.target:
+            self.rate += self.alpha * (self.target - self.rate)
+        elif self._held_back:
+            self._held_back = False
+            self.rate += self.sigma
+        self.rate = min(self.rate, self.max_rate)
+    
+    def decrease_rate(self, retry_after: float = 0.0) -> None:
+        """
+        Record a throttled request and back off.
+        
+        Args:
+            retry_after: Seconds to hold all acquisition (server Retry-After)
+        """
+        self._total_throttled += 1
+        self._refill()
+        
+        self.target = self._last_success_rate
+        self.rate = max(self.delta, self.rate * self.beta)
+        self._held_back = False
+        
+        # Drop any saved-up burst so the lower rate takes effect immediately
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after > 0:
+            self._hold_until = max(self._hold_until, time.monotonic() + retry_after)
+        
+        logger.warning(f"AdaptiveTokenBucket '{self.name}' throttled: rate -> {self.rate:.1f}/s, target {self.target:.1f}/s")
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get bucket metrics for monitoring."""
+        self._refill()
+        return {
+            "name": self.name,
+            "tokens_available": self._tokens,
+            "capacity": self.capacity,
+            "refill_rate": self.rate,
+            "target_rate": self.target,
+            "max_rate": self.max_rate,
+            "total_acquired": self._total_acquired,
+            "total_waited": self._total_waited,
+            "total_throttled": self._total_throttled,
+        }
+
 # =============================================================================
 # IMPORTS FOR DATETIME (fix missing import)
 # =============================================================================
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the packages the way the app does, from the 08_WHALE_INTEL root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,74 @@
+"""AdaptiveTokenBucket rate control: bounded increase, multiplicative decrease."""
+
+import asyncio
+
+import pytest
+
+from rate_limiting import AdaptiveTokenBucket
+
+
+def make_bucket(**kwargs):
+    params = dict(init_rate=330.0, capacity=330.0, alpha=0.5, beta=0.7, sigma=3.3, delta=33.0)
+    params.update(kwargs)
+    return AdaptiveTokenBucket("test", **params)
+
+
+def test_successes_never_raise_rate_above_max_rate():
+    bucket = make_bucket()
+
+    for _ in range(1000):
+        bucket.increase_rate()
+
+    assert bucket.rate == 330.0
+
+
+def test_no_probe_above_target_unless_a_caller_was_held_back():
+    bucket = make_bucket(max_rate=400.0)
+
+    for _ in range(100):
+        bucket.increase_rate()
+    assert bucket.rate == 330.0
+
+    # One waiter slept for tokens: exactly one probe step follows
+    bucket._held_back = True
+    bucket.increase_rate()
+    bucket.increase_rate()
+    assert bucket.rate == pytest.approx(333.3)
+
+
+def test_acquire_marks_held_back_only_when_it_waits():
+    bucket = make_bucket(init_rate=1000.0, capacity=10.0, max_rate=2000.0)
+
+    asyncio.run(bucket.acquire(10.0))
+    assert not bucket._held_back
+
+    asyncio.run(bucket.acquire(5.0))
+    assert bucket._held_back
+
+
+def test_throttle_cuts_rate_and_recovery_returns_to_last_good_rate():
+    bucket = make_bucket()
+
+    bucket.increase_rate()
+    bucket.decrease_rate()
+    assert bucket.rate == pytest.approx(330.0 * 0.7)
+    assert bucket.target == 330.0
+
+    for _ in range(50):
+        bucket.increase_rate()
+    assert bucket.rate == pytest.approx(330.0)
+    assert bucket.rate <= bucket.max_rate
+
+
+def test_decrease_never_goes_below_delta():
+    bucket = make_bucket()
+
+    for _ in range(50):
+        bucket.decrease_rate()
+
+    assert bucket.rate == 33.0
+
+
+def test_max_rate_below_init_rate_is_rejected():
+    with pytest.raises(ValueError):
+        make_bucket(max_rate=100.0)
@@ -0,0 +1,63 @@
+"""AlchemyClient must fail closed once the monthly CU budget is spent."""
+
+import asyncio
+
+from clients.alchemy import AlchemyClient, CU_COSTS
+from rate_limiting.budget_tracker import APILimits, BudgetTracker
+
+
+class RecordingSession:
+    """Stands in for aiohttp.ClientSession; counts posts and fails them."""
+
+    closed = False
+
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, *args, **kwargs):
+        self.posts += 1
+        raise RuntimeError("network disabled in tests")
+
+
+def make_client(monthly_limit):
+    tracker = BudgetTracker({
+        "alchemy": APILimits(
+            name="alchemy",
+            requests_per_second=12.0,
+            burst_capacity=20,
+            monthly_limit=monthly_limit,
+        ),
+    })
+    client = AlchemyClient("key", "https://alchemy.invalid", "wss://alchemy.invalid")
+    client._budget_tracker = tracker
+    client._http_session = RecordingSession()
+    return client, tracker
+
+
+def test_rpc_call_fails_closed_when_budget_exhausted():
+    client, tracker = make_client(monthly_limit=100)
+    assert tracker.charge_budget("alchemy", 100)
+
+    result = asyncio.run(client._rpc_call("eth_blockNumber"))
+
+    assert result is None
+    assert client._http_session.posts == 0
+
+
+def test_batch_fails_closed_when_budget_exhausted():
+    client, tracker = make_client(monthly_limit=100)
+    assert tracker.charge_budget("alchemy", 100)
+
+    result = asyncio.run(client._post_batch("eth_getBalance", [["0x1", "latest"]] * 3))
+
+    assert result is None
+    assert client._http_session.posts == 0
+
+
+def test_rpc_call_charges_cu_against_budget():
+    client, tracker = make_client(monthly_limit=1_000)
+
+    asyncio.run(client._rpc_call("eth_call", [{}, "latest"]))
+
+    assert client._http_session.posts == 1
+    assert tracker.get_status("alchemy")["monthly_budget"]["budget_used"] == CU_COSTS["eth_call"]